@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AgentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'agents'
+
+    def ready(self):
+        from . import checks  # noqa: F401  (registers system checks)
+        from . import signals  # noqa: F401  (connects receivers)
@@ -0,0 +1,38 @@
+"""
+System checks for the agents app
+"""
+
+from collections import Counter
+
+from django.core.checks import Error, Tags, register
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+def _global_url_names(patterns):
+    """Yield URL names reachable without a namespace"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace is None:
+                yield from _global_url_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern.name
+
+
+@register(Tags.urls)
+def check_unique_url_names(app_configs, **kwargs):
+    """
+    The agents router is mounted without a namespace, so its basenames share
+    the global URL name space and must not collide with another app's names.
+    """
+    duplicates = [
+        name for name, count in Counter(_global_url_names(get_resolver().url_patterns)).items()
+        if count > 1
+    ]
+    return [
+        Error(
+            f"URL name '{name}' is defined more than once outside a namespace.",
+            hint='Give the route a unique basename or mount it under a namespace.',
+            id='agents.E001',
+        )
+        for name in sorted(duplicates)
+    ]
@@ -218,11 +218,21 @@ class SessionConsumer(AsyncWebsocketConsumer):
         }))
     
     async def stream_end(self, event):
-        """Handle stream end"""
-        await self.send(text_data=json.dumps({
+        """Handle stream end; ``error`` is set when the completion failed"""
+        payload = {
             'type': 'stream_end',
             'full_content': event.get('full_content', ''),
             'done': True
+        }
+        if event.get('error'):
+            payload['error'] = event['error']
+        await self.send(text_data=json.dumps(payload))
+    
+    async def workflow_progress(self, event):
+        """Forward a workflow progress snapshot"""
+        await self.send(text_data=json.dumps({
+            'type': 'workflow_progress',
+            'progress': event['progress']
         }))
     
     # Helper methods
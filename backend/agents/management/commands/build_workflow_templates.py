@@ -0,0 +1,19 @@
+"""
+Django management command to precompile workflow templates into JSON
+"""
+
+import orjson
+from django.core.management.base import BaseCommand
+
+from agents.services.workflow_templates import TEMPLATES_JSON_PATH, build_templates
+
+
+class Command(BaseCommand):
+    help = 'Precompile the workflow template registry into workflow_templates.json'
+
+    def handle(self, *args, **options):
+        templates = build_templates()
+        TEMPLATES_JSON_PATH.write_bytes(orjson.dumps(templates))
+        self.stdout.write(
+            self.style.SUCCESS(f'Wrote {len(templates)} templates to {TEMPLATES_JSON_PATH}')
+        )
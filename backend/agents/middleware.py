@@ -4,6 +4,29 @@ from django.utils.deprecation import MiddlewareMixin
 
 logger = logging.getLogger(__name__)
 
+class ShortCircuitMiddleware:
+    """
+    Flag safe requests to high-QPS polling endpoints (see
+    ``agents.urls.SHORT_CIRCUIT_PREFIXES``) with ``request._short_circuit``
+    so downstream middleware can skip non-essential work.
+    """
+    
+    SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Imported here: the URLconf pulls in views, which need the app registry
+        from .urls import SHORT_CIRCUIT_PREFIXES
+        self.prefixes = SHORT_CIRCUIT_PREFIXES
+    
+    def __call__(self, request):
+        request._short_circuit = (
+            request.method in self.SAFE_METHODS
+            and request.path.startswith(self.prefixes)
+        )
+        return self.get_response(request)
+
+
 class PerformanceTrackingMiddleware(MiddlewareMixin):
     """
     Middleware to track performance metrics for agent operations
@@ -11,6 +34,8 @@ class PerformanceTrackingMiddleware(MiddlewareMixin):
     
     def process_request(self, request):
         """Record the start time of the request"""
+        if getattr(request, '_short_circuit', False):
+            return None
         request.start_time = time.time()
         return None
     
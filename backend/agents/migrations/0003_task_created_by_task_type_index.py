@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0002_auto_20250928_1713'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_by', 'task_type', 'created_at'], name='agents_task_created_6f6fbc_idx'),
+        ),
+    ]
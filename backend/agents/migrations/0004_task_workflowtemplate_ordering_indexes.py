@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0003_task_created_by_task_type_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_by', '-created_at'], name='agents_task_created_b54fdf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowtemplate',
+            index=models.Index(fields=['is_public', '-usage_count'], name='agents_work_is_publ_a916cd_idx'),
+        ),
+    ]
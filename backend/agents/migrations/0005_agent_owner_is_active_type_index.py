@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0004_task_workflowtemplate_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='agent',
+            index=models.Index(fields=['owner', 'is_active', 'type'], name='agents_agen_owner_i_bd3f43_idx'),
+        ),
+    ]
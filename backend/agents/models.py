@@ -36,6 +36,9 @@ class Agent(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['owner', 'is_active', 'type']),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.type})"
@@ -159,6 +162,8 @@ class Task(models.Model):
             models.Index(fields=['assigned_agent', 'status']),
             models.Index(fields=['task_type']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['created_by', 'task_type', 'created_at']),
+            models.Index(fields=['created_by', '-created_at']),
         ]
     
     def __str__(self):
@@ -213,6 +218,7 @@ class WorkflowTemplate(models.Model):
             models.Index(fields=['category']),
             models.Index(fields=['is_public']),
             models.Index(fields=['usage_count']),
+            models.Index(fields=['is_public', '-usage_count']),
         ]
     
     def __str__(self):
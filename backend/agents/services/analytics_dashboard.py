@@ -2,6 +2,7 @@
 
 import json
 import logging
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from django.utils import timezone
@@ -752,9 +753,11 @@ class AnalyticsDashboard:
     async def _get_agent_last_activity(self, agent: Agent) -> Optional[str]:
         """Get agent's last activity timestamp."""
         try:
-            last_task = Task.objects.filter(assigned_agent=agent).order_by('-created_at').first()
-            if last_task:
-                return last_task.created_at.isoformat()
+            last_created = Task.objects.filter(assigned_agent=agent).order_by('-created_at').values_list(
+                'created_at', flat=True
+            ).first()
+            if last_created:
+                return last_created.isoformat()
         except Exception:
             pass
         
@@ -785,29 +788,28 @@ class AnalyticsDashboard:
     
     async def _analyze_failure_patterns(self, failed_tasks) -> Dict:
         """Analyze patterns in failed tasks."""
-        patterns = {
-            'by_type': {},
-            'by_agent': {},
-            'by_time': {},
-            'common_factors': []
-        }
+        by_type = Counter()
+        by_agent = Counter()
+        by_time = Counter()
         
-        # Group by task type
+        # Group by task type, agent and hour of day
         for task in failed_tasks:
-            patterns['by_type'][task.task_type] = patterns['by_type'].get(task.task_type, 0) + 1
-            
+            by_type[task.task_type] += 1
             if task.assigned_agent:
-                agent_name = task.assigned_agent.name
-                patterns['by_agent'][agent_name] = patterns['by_agent'].get(agent_name, 0) + 1
-            
-            # Group by hour of day
-            hour = task.created_at.hour
-            patterns['by_time'][hour] = patterns['by_time'].get(hour, 0) + 1
+                by_agent[task.assigned_agent.name] += 1
+            by_time[task.created_at.hour] += 1
+        
+        patterns = {
+            'by_type': dict(by_type),
+            'by_agent': dict(by_agent),
+            'by_time': dict(by_time),
+            'common_factors': []
+        }
         
         # Identify common factors
-        if patterns['by_type']:
-            most_failed_type = max(patterns['by_type'].items(), key=lambda x: x[1])
-            patterns['common_factors'].append(f"Most failed task type: {most_failed_type[0]} ({most_failed_type[1]} failures)")
+        if by_type:
+            (most_failed_type, failures), = by_type.most_common(1)
+            patterns['common_factors'].append(f"Most failed task type: {most_failed_type} ({failures} failures)")
         
         return patterns
     
@@ -7,8 +7,10 @@ parallel execution, error handling, and result aggregation.
 
 import asyncio
 import logging
+import uuid
 from typing import Dict, List, Any, Optional, Set, Callable
 from datetime import datetime
+from functools import lru_cache
 from enum import Enum
 from dataclasses import dataclass, field
 from collections import defaultdict
@@ -25,6 +27,14 @@ from .groq_service import GroqService
 logger = logging.getLogger(__name__)
 
 
+class TemplateNotFound(ValueError):
+    """No workflow template exists with the requested id"""
+    
+    def __init__(self, workflow_id: str):
+        super().__init__(f"Workflow template '{workflow_id}' not found")
+        self.workflow_id = workflow_id
+
+
 class StepStatus(Enum):
     """Status of workflow steps"""
     PENDING = "pending"
@@ -111,15 +121,20 @@ class WorkflowOrchestrator:
             
         Returns:
             Workflow execution results
+            
+        Raises:
+            TemplateNotFound: if no template has the given id
         """
+        # Load workflow template
+        template = get_template(workflow_id)
+        if not template:
+            raise TemplateNotFound(workflow_id)
+        
+        # Create workflow execution; the id must stay unique across the
+        # concurrent runs that share one orchestrator
+        execution_id = f"{workflow_id}_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
+        execution = None
         try:
-            # Load workflow template
-            template = get_template(workflow_id)
-            if not template:
-                raise ValueError(f"Workflow template '{workflow_id}' not found")
-            
-            # Create workflow execution
-            execution_id = f"{workflow_id}_{int(datetime.now().timestamp())}"
             execution = self._create_workflow_execution(
                 execution_id, template, input_data, user_id, session_id
             )
@@ -669,3 +684,13 @@ class WorkflowOrchestrator:
                 for step_id, step in execution.steps.items()
             }
         }
+
+
+@lru_cache(maxsize=None)
+def get_workflow_orchestrator() -> WorkflowOrchestrator:
+    """
+    The process-wide orchestrator, so its Groq client (and HTTP connection
+    pool) is reused across requests. Per-run state lives on each
+    WorkflowExecution, never on the orchestrator itself.
+    """
+    return WorkflowOrchestrator()
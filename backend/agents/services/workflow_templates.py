@@ -4,9 +4,17 @@ Real-world workflow templates for common business and development tasks.
 These templates define multi-agent coordination for solving actual problems.
 """
 
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional
 from enum import Enum
 
+import orjson
+
+# Precompiled registry written by `manage.py build_workflow_templates`
+TEMPLATES_JSON_PATH = Path(__file__).with_name('workflow_templates.json')
+
 
 class WorkflowCategory(Enum):
     """Categories of workflows available"""
@@ -24,20 +32,9 @@ class WorkflowTemplates:
     """Predefined templates for real-world agent workflows"""
     
     @staticmethod
-    def get_all_templates() -> Dict[str, Dict]:
-        """Get all available workflow templates"""
-        return {
-            'data_analysis_pipeline': WorkflowTemplates.data_analysis_pipeline(),
-            'customer_support_ticket': WorkflowTemplates.customer_support_ticket(),
-            'content_creation_workflow': WorkflowTemplates.content_creation_workflow(),
-            'code_review_process': WorkflowTemplates.code_review_process(),
-            'bug_investigation': WorkflowTemplates.bug_investigation(),
-            'research_and_summarize': WorkflowTemplates.research_and_summarize(),
-            'document_generation': WorkflowTemplates.document_generation(),
-            'automated_testing': WorkflowTemplates.automated_testing(),
-            'data_quality_check': WorkflowTemplates.data_quality_check(),
-            'onboarding_automation': WorkflowTemplates.onboarding_automation(),
-        }
+    def get_all_templates() -> Mapping[str, Mapping]:
+        """Get all available workflow templates (built once at import, read-only)"""
+        return _ALL_TEMPLATES
     
     @staticmethod
     def data_analysis_pipeline() -> Dict:
@@ -1119,9 +1116,49 @@ class WorkflowTemplates:
         }
 
 
+def build_templates() -> Dict[str, Dict]:
+    """Evaluate every template builder into a registry keyed by template id"""
+    return {
+        template['id']: template
+        for template in (
+            WorkflowTemplates.data_analysis_pipeline(),
+            WorkflowTemplates.customer_support_ticket(),
+            WorkflowTemplates.content_creation_workflow(),
+            WorkflowTemplates.code_review_process(),
+            WorkflowTemplates.bug_investigation(),
+            WorkflowTemplates.research_and_summarize(),
+            WorkflowTemplates.document_generation(),
+            WorkflowTemplates.automated_testing(),
+            WorkflowTemplates.data_quality_check(),
+            WorkflowTemplates.onboarding_automation(),
+        )
+    }
+
+
+def _load_templates() -> Dict[str, Dict]:
+    """
+    Load the precompiled JSON registry with one bulk decode.
+    Falls back to the builders when the file is missing or older than this module.
+    """
+    try:
+        if TEMPLATES_JSON_PATH.stat().st_mtime >= Path(__file__).stat().st_mtime:
+            return orjson.loads(TEMPLATES_JSON_PATH.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        pass
+    return build_templates()
+
+
+# Registry assembled once at import; templates are static data
+_ALL_TEMPLATES = MappingProxyType({
+    template_id: MappingProxyType(template)
+    for template_id, template in _load_templates().items()
+})
+
+
 # Export all templates
+@lru_cache(maxsize=None)
 def get_template(template_id: str) -> Optional[Dict]:
-    """Get a specific template by ID"""
+    """Get a specific template by ID (cached; treat the result as read-only)"""
     templates = WorkflowTemplates.get_all_templates()
     return templates.get(template_id)
 
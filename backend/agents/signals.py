@@ -0,0 +1,32 @@
+"""
+Signal receivers for the agents app (connected in AgentsConfig.ready).
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import WorkflowTemplate
+
+# Cached workflow template listings are keyed on this version, so bumping it
+# invalidates every public and per-user listing at once
+WORKFLOW_TEMPLATES_VERSION_KEY = 'wf_templates:version'
+
+
+def workflow_templates_cache_key(user_id=None):
+    """Cache key for the template listing seen by ``user_id`` (None: public only)"""
+    # A missing version (never set, or evicted) starts from the clock so it
+    # can't collide with a version that still has entries cached
+    version = cache.get_or_set(WORKFLOW_TEMPLATES_VERSION_KEY, lambda: int(time.time()), None)
+    scope = f'user:{user_id}' if user_id else 'public'
+    return f'wf_templates:v{version}:{scope}'
+
+
+@receiver([post_save, post_delete], sender=WorkflowTemplate)
+def invalidate_workflow_templates(sender, **kwargs):
+    try:
+        cache.incr(WORKFLOW_TEMPLATES_VERSION_KEY)
+    except ValueError:
+        cache.set(WORKFLOW_TEMPLATES_VERSION_KEY, int(time.time()), None)
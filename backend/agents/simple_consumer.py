@@ -2,20 +2,63 @@
 Simple WebSocket Consumer for testing connections
 """
 
-import json
+import asyncio
 import uuid
+from typing import Any, Callable, ClassVar, Dict
+
+import msgspec
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Get the custom user model
 User = get_user_model()
 
+
+def _timestamp():
+    """ISO-8601 UTC timestamp, taken once per message and reused"""
+    return datetime.now(timezone.utc).isoformat()
+
+
+class IncomingEnvelope(msgspec.Struct, frozen=True):
+    """Client frame received on the simple session socket"""
+    type: str = 'message'
+    content: str = ''
+    message_type: str = 'text'
+    user_id: Any = None
+
+
+class ChatMessage(msgspec.Struct, frozen=True):
+    """Chat message broadcast to the session group"""
+    id: str
+    content: str
+    message_type: str
+    sender: str
+    timestamp: str
+
+
+_decode_envelope = msgspec.json.Decoder(IncomingEnvelope).decode
+_encoder = msgspec.json.Encoder()
+
+
+def _dumps(payload):
+    """Encode an outgoing frame as JSON text"""
+    return _encoder.encode(payload).decode()
+
+
+PONG_TEXT = _dumps({'type': 'pong'})
+
+
 class SimpleSessionConsumer(AsyncWebsocketConsumer):
     """Simple WebSocket consumer for testing session connections"""
     
+    # Incoming frame type -> handler, populated below the class body
+    _HANDLERS: ClassVar[Dict[str, Callable]] = {}
+    
     async def connect(self):
+        # Fire-and-forget sends that don't gate the current frame
+        self._background = set()
         try:
             self.session_id = self.scope['url_route']['kwargs']['session_id']
             self.session_group_name = f'session_{self.session_id}'
@@ -35,11 +78,11 @@ class SimpleSessionConsumer(AsyncWebsocketConsumer):
             print(f"DEBUG: WebSocket connection accepted for session: {self.session_id}")
             
             # Send connection confirmation
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=_dumps({
                 'type': 'connection_established',
                 'session_id': self.session_id,
                 'message': 'Connected to session (Simple Consumer)',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _timestamp()
             }))
         except Exception as e:
             print(f"ERROR: Failed to connect WebSocket: {e}")
@@ -58,33 +101,36 @@ class SimpleSessionConsumer(AsyncWebsocketConsumer):
     
     async def receive(self, text_data):
         try:
-            data = json.loads(text_data)
-            message_type = data.get('type', 'message')
+            data = _decode_envelope(text_data)
+            message_type = data.type
             
             print(f"DEBUG: Received WebSocket message: {data}")
             
-            if message_type == 'chat_message':
-                await self.handle_chat_message(data)
-            elif message_type == 'ping':
-                # Respond to ping with pong
-                await self.send(text_data=json.dumps({
-                    'type': 'pong'
-                }))
-                print(f"DEBUG: Sent pong response")
-            else:
-                await self.send_error(f'Unknown message type: {message_type}')
-                
-        except json.JSONDecodeError:
+            handler = self._HANDLERS.get(message_type, SimpleSessionConsumer._handle_unknown)
+            await handler(self, data)
+            
+        except msgspec.ValidationError as e:
+            await self.send_error(f'Invalid message: {e}')
+        except msgspec.DecodeError:
             await self.send_error('Invalid JSON format')
         except Exception as e:
             print(f"DEBUG: Error in WebSocket receive: {e}")
             await self.send_error(f'Processing error: {str(e)}')
     
+    async def _handle_ping(self, data):
+        """Respond to ping with pong"""
+        await self.send(text_data=PONG_TEXT)
+        print(f"DEBUG: Sent pong response")
+    
+    async def _handle_unknown(self, data):
+        """Reject frame types without a registered handler"""
+        await self.send_error(f'Unknown message type: {data.type}')
+    
     async def handle_chat_message(self, data):
         """Handle incoming chat message"""
-        content = data.get('content', '')
-        user_id = data.get('user_id')
-        message_type = data.get('message_type', 'text')
+        content = data.content
+        user_id = data.user_id
+        message_type = data.message_type
         
         print(f"DEBUG: Processing chat message: '{content}'")
         
@@ -94,28 +140,30 @@ class SimpleSessionConsumer(AsyncWebsocketConsumer):
         
         # Echo the message back to the group
         message_id = str(uuid.uuid4())
-        timestamp = datetime.now().isoformat()
+        timestamp = _timestamp()
+        message = ChatMessage(
+            id=message_id,
+            content=content,
+            message_type=message_type,
+            sender='Anonymous',
+            timestamp=timestamp
+        )
         
+        # Channel layers only carry builtin types
         await self.channel_layer.group_send(
             self.session_group_name,
             {
                 'type': 'chat_message',
-                'message': {
-                    'id': message_id,
-                    'content': content,
-                    'message_type': message_type,
-                    'sender': 'Anonymous',
-                    'timestamp': timestamp
-                }
+                'message': msgspec.to_builtins(message)
             }
         )
         
         print(f"DEBUG: Message echoed to group: {self.session_group_name}")
         
-        # Send a simple agent response after a brief delay
+        # Send a simple agent response without holding up the next frame
         response_content = f"Hello! I received your message: '{content}'. This is a test response from the simple consumer."
         
-        await self.channel_layer.group_send(
+        self._schedule(self.channel_layer.group_send(
             self.session_group_name,
             {
                 'type': 'agent_response',
@@ -125,17 +173,24 @@ class SimpleSessionConsumer(AsyncWebsocketConsumer):
                     'agent_id': 'test-agent-123'
                 },
                 'original_message_id': message_id,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             }
-        )
+        ))
         
-        print(f"DEBUG: Agent response sent to group: {self.session_group_name}")
+        print(f"DEBUG: Agent response queued for group: {self.session_group_name}")
+    
+    def _schedule(self, coro):
+        """Run a non-essential coroutine in the background, keeping a reference until done"""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
     
     # WebSocket message handlers
     async def chat_message(self, event):
         """Send chat message to WebSocket"""
         print(f"DEBUG: Sending chat message to WebSocket: {event['message']}")
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=_dumps({
             'type': 'chat_message',
             'message': event['message']
         }))
@@ -143,7 +198,7 @@ class SimpleSessionConsumer(AsyncWebsocketConsumer):
     async def agent_response(self, event):
         """Send agent response to WebSocket"""
         print(f"DEBUG: Sending agent response to WebSocket: {event['response']}")
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=_dumps({
             'type': 'agent_response',
             'response': event['response'],
             'original_message_id': event.get('original_message_id'),
@@ -153,7 +208,13 @@ class SimpleSessionConsumer(AsyncWebsocketConsumer):
     async def send_error(self, error_message):
         """Send error message"""
         print(f"DEBUG: Sending error: {error_message}")
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=_dumps({
             'type': 'error',
             'message': error_message
-        }))
\ No newline at end of file
+        }))
+
+
+SimpleSessionConsumer._HANDLERS = {
+    'chat_message': SimpleSessionConsumer.handle_chat_message,
+    'ping': SimpleSessionConsumer._handle_ping,
+}
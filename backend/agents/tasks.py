@@ -0,0 +1,133 @@
+"""
+Background tasks for agent coordination.
+
+The views persist the incoming message/task and enqueue one of these on
+commit; the coordinator (or Groq stream) then runs on a Celery worker and
+delivers its reply to the session's Channels group instead of the HTTP
+response. Workflows are polled instead: their result is the task result.
+"""
+
+import asyncio
+import logging
+from functools import lru_cache
+
+from celery import shared_task
+from django.utils import timezone
+
+from .models import Message, Task
+from .services.groq_service import GroqService
+from .ws import ws_send
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def process_message_task(message_id):
+    """Run the coordinator for a stored message; it pushes its own reply"""
+    from .services.agent_coordinator import AgentCoordinator
+
+    message = Message.objects.select_related('session').get(id=message_id)
+    AgentCoordinator(message.session).process_message(message)
+
+
+@shared_task(ignore_result=True)
+def execute_task_task(task_id):
+    """Execute a task that the view has already moved to in_progress"""
+    from .services.agent_coordinator import AgentCoordinator
+
+    task = Task.objects.select_related('session', 'assigned_agent').get(id=task_id)
+    AgentCoordinator(task.session).execute_task(task)
+
+
+@shared_task(ignore_result=True)
+def process_multimodal_task(message_id):
+    """Process a multimodal message and push the result to its session"""
+    from .services.agent_coordinator import AgentCoordinator
+
+    message = Message.objects.select_related('session').get(id=message_id)
+    response = AgentCoordinator(message.session).process_multimodal_message(message)
+
+    ws_send(
+        f"session_{message.session_id}",
+        {
+            "type": "agent_response",
+            "response": response,
+            "original_message_id": str(message.id),
+            "timestamp": timezone.now().isoformat()
+        }
+    )
+
+
+@shared_task(ignore_result=True)
+def stream_completion_task(messages, session_id, model=None):
+    """Forward a Groq completion to the session group as its tokens arrive"""
+    group = f"session_{session_id}"
+
+    ws_send(group, {
+        "type": "stream_start",
+        "message": "Starting stream..."
+    })
+
+    # Chunks are forwarded here rather than by GroqService, so every frame of
+    # the stream goes out through ws_send's loop and channel layer connection
+    full_content = ''
+    error = None
+    for chunk in GroqService().stream_completion(messages, None, model=model):
+        if chunk.get('error'):
+            error = chunk['error']
+            break
+        full_content = chunk.get('full_content', full_content)
+        if chunk.get('content'):
+            ws_send(group, {
+                "type": "stream_update",
+                "chunk": chunk['content'],
+                "full_content": full_content
+            })
+
+    end = {
+        "type": "stream_end",
+        "full_content": full_content
+    }
+    if error:
+        end["error"] = error
+    ws_send(group, end)
+
+
+@lru_cache(maxsize=None)
+def _workflow_engine():
+    """One WorkflowEngine per worker process"""
+    from .services.workflow_engine import WorkflowEngine
+
+    return WorkflowEngine()
+
+
+@shared_task
+def run_workflow(workflow_definition, input_data, user_id, session_id=None):
+    """Execute a workflow; the engine's summary is stored as the task result"""
+    return asyncio.run(_workflow_engine().execute_workflow(
+        workflow_definition=workflow_definition,
+        input_data=input_data,
+        user_id=user_id,
+        session_id=session_id
+    ))
+
+
+@shared_task
+def run_workflow_template(workflow_id, input_data, user_id, session_id=None):
+    """Execute a workflow template; its compiled results are the task result"""
+    callback = None
+    if session_id:
+        group = f"session_{session_id}"
+
+        def callback(progress):
+            ws_send(group, {"type": "workflow_progress", "progress": progress})
+
+    from .services.workflow_orchestrator import get_workflow_orchestrator
+
+    return asyncio.run(get_workflow_orchestrator().execute_workflow(
+        workflow_id=workflow_id,
+        input_data=input_data,
+        user_id=user_id,
+        session_id=session_id,
+        callback=callback
+    ))
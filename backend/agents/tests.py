@@ -1,3 +1,17 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .urls import URL_TEMPLATES
+
+
+class URLTemplatesTests(SimpleTestCase):
+    """The hardcoded URL_TEMPLATES table must match what the router generates"""
+
+    def test_templates_match_router(self):
+        pk = '6f1c3a52-8f5e-4d6b-9a39-2b7d0c1e4f10'
+        for basename, template in URL_TEMPLATES.items():
+            with self.subTest(basename=basename):
+                self.assertEqual(
+                    reverse(f'{basename}-detail', args=[pk]),
+                    template.format(pk=pk),
+                )
@@ -0,0 +1,106 @@
+"""
+Helpers for building the agents URLConfs
+"""
+
+from django.urls import include, path, re_path
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
+from rest_framework.routers import SimpleRouter
+
+
+def cache_viewset(viewset, timeout):
+    """
+    Subclass ``viewset`` with its read-only handlers wrapped in cache_page().
+
+    Covers list/retrieve and every extra action routed for GET only, except
+    those named in the viewset's ``page_cache_exempt`` (handlers that cache
+    for themselves). Responses vary on the credentials headers so cached data
+    is never shared across users.
+    """
+    decorate = method_decorator([cache_page(timeout), vary_on_headers('Authorization', 'Cookie')])
+    names = [name for name in ('list', 'retrieve') if hasattr(viewset, name)]
+    names += [
+        extra.__name__ for extra in viewset.get_extra_actions()
+        if set(extra.mapping) == {'get'}
+    ]
+    exempt = getattr(viewset, 'page_cache_exempt', ())
+    names = [name for name in names if name not in exempt]
+    attrs = {name: decorate(getattr(viewset, name)) for name in names}
+    attrs.update(__module__=viewset.__module__, __qualname__=viewset.__qualname__)
+    return type(viewset.__name__, (viewset,), attrs)
+
+
+def with_related(viewset, select=(), prefetch=()):
+    """
+    Subclass ``viewset`` so get_queryset() applies select_related(*select)
+    and prefetch_related(*prefetch) to whatever queryset it already builds.
+    """
+    def get_queryset(self):
+        queryset = super(subclass, self).get_queryset()
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+    subclass = type(viewset.__name__, (viewset,), {
+        '__module__': viewset.__module__,
+        '__qualname__': viewset.__qualname__,
+        'get_queryset': get_queryset,
+    })
+    return subclass
+
+
+class AutoPrefetchRouter(SimpleRouter):
+    """
+    SimpleRouter that applies per-basename relation hints on registration.
+
+    ``prefetch_map`` maps a basename to ``(select_related, prefetch_related)``
+    field tuples; viewsets without an entry are registered unchanged.
+    """
+
+    def __init__(self, prefetch_map=None, **kwargs):
+        self.prefetch_map = prefetch_map or {}
+        super().__init__(**kwargs)
+
+    def register(self, prefix, viewset, basename=None):
+        hints = self.prefetch_map.get(basename)
+        if hints:
+            viewset = with_related(viewset, *hints)
+        super().register(prefix, viewset, basename=basename)
+
+
+def index_by_prefix(registry, routes):
+    """
+    Group router ``routes`` into one include() per registered prefix.
+    
+    The resolver then behaves like a trie keyed on path segments: it matches
+    the first segment against the viewset prefixes and only scans the routes
+    of the matching viewset, instead of testing every generated regex in turn.
+    Route names and default args are preserved, so reverse() is unaffected.
+    """
+    urlpatterns = []
+    for prefix, _, _ in registry:
+        head = f'^{prefix}/'
+        children = [
+            re_path('^' + str(route.pattern)[len(head):], route.callback, route.default_args, name=route.name)
+            for route in routes
+            if str(route.pattern).startswith(head)
+        ]
+        urlpatterns.append(path(f'{prefix}/', include(children)))
+        precompile(children)
+    return precompile(urlpatterns)
+
+
+def precompile(urlpatterns):
+    """
+    Compile the regex of every pattern in ``urlpatterns`` and return the list.
+
+    Django compiles each pattern lazily on the first resolve() and then caches
+    the compiled regex on the pattern, so doing it at import moves the cost to
+    worker startup (and, with --preload, out of the forked workers entirely).
+    """
+    for urlpattern in urlpatterns:
+        urlpattern.pattern.regex
+    return urlpatterns
@@ -1,32 +1,59 @@
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from . import views
-from . import collaboration_views
-from . import workflow_views
-
-router = DefaultRouter()
-# Existing endpoints
-router.register(r'agents', views.AgentViewSet, basename='agent')
-router.register(r'sessions', views.SessionViewSet, basename='session')
-router.register(r'tasks', views.TaskViewSet, basename='task')
-router.register(r'messages', views.MessageViewSet, basename='message')
-router.register(r'performance', views.PerformanceViewSet, basename='performance')
-router.register(r'memory', views.AgentMemoryViewSet, basename='memory')
-router.register(r'groq', views.GroqIntegrationView, basename='groq')
-
-# Enhanced feature endpoints
-router.register(r'smart-agents', views.SmartAgentViewSet, basename='smart-agents')
-router.register(r'workflows', workflow_views.WorkflowViewSet, basename='workflows')
-router.register(r'multimodal', views.MultiModalProcessorViewSet, basename='multimodal')
-router.register(r'analytics', views.AnalyticsDashboardViewSet, basename='analytics')
-router.register(r'automation', views.AutomationViewSet, basename='automation')
-
-# Collaboration endpoints
-router.register(r'collaboration', collaboration_views.CollaborationViewSet, basename='collaboration')
-router.register(r'notifications', collaboration_views.NotificationViewSet, basename='notifications')
-
-app_name = 'agents'
-
-urlpatterns = [
-    path('api/', include(router.urls)),
-]
\ No newline at end of file
+import re
+
+from django.http import JsonResponse
+from django.urls import include, path, re_path
+from . import urls_aux, urls_core
+from .url_utils import precompile
+
+# Routes are split into two URLConfs: urls_core (messages, sessions, tasks,
+# agents) and urls_aux (everything else). Both stay under /agents/api/ so the
+# public URLs are unchanged; see _gate() for how each subtree is entered.
+# Within each URLConf, viewsets are registered in descending expected request
+# rate, since the resolver scans patterns linearly.
+
+# Hardcoded detail paths for hot resources, so URLs can be built with str.format
+# instead of reverse(). Must mirror the router.register() calls in urls_core and the
+# 'agents/' mount in backend/urls.py -- agents.tests keeps them in sync.
+URL_TEMPLATES = {
+    'agent': '/agents/api/agents/{pk}/',
+    'session': '/agents/api/sessions/{pk}/',
+    'task': '/agents/api/tasks/{pk}/',
+    'message': '/agents/api/messages/{pk}/',
+}
+
+# High-QPS polling endpoints; ShortCircuitMiddleware flags reads on these
+# paths so downstream middleware can skip non-essential per-request work
+SHORT_CIRCUIT_PREFIXES = (
+    '/agents/api/notifications/',
+    '/agents/api/messages/',
+)
+
+# Static API index of every registered route, built once at import -- the
+# api/ root (a common liveness target) never introspects viewsets or reverses
+STATIC_SCHEMA = {
+    basename: f'/agents/api/{prefix}/'
+    for urlconf in (urls_core, urls_aux)
+    for prefix, _, basename in urlconf.router.registry
+}
+
+
+def api_index(request):
+    """Serve the prebuilt API index"""
+    return JsonResponse(STATIC_SCHEMA)
+
+
+def _gate(urlconf):
+    """
+    Mount ``urlconf`` under api/ behind a lookahead on its registered prefixes.
+    The resolver only descends into the subtree when the first path segment
+    belongs to it, so core requests never scan the aux patterns and vice versa.
+    """
+    prefixes = '|'.join(re.escape(prefix) for prefix, _, _ in urlconf.router.registry)
+    return re_path(rf'^api/(?=(?:{prefixes})/)', include(urlconf))
+
+
+urlpatterns = precompile([
+    path('api/', api_index, name='agents-api-root'),
+    _gate(urls_core),
+    _gate(urls_aux),
+])
@@ -0,0 +1,47 @@
+"""
+Auxiliary agent endpoints: collaboration, workflows, analytics, automation,
+performance, memory and Groq. Mounted under api/ by agents.urls.
+"""
+
+from . import views
+from . import collaboration_views
+from . import workflow_views
+from .url_utils import AutoPrefetchRouter, cache_viewset, index_by_prefix
+
+# basename -> cache_page() TTL in seconds for the GET handlers of read-heavy
+# dashboards; anything not listed here is never cached at the HTTP layer
+CACHE_TTLS = {
+    'analytics': 60,
+    'performance': 15,
+}
+
+# (prefix, viewset, basename) in descending expected request rate (see agents.urls)
+ROUTES = (
+    ('notifications', collaboration_views.NotificationViewSet, 'notifications'),
+    ('collaboration', collaboration_views.CollaborationViewSet, 'collaboration'),
+    ('workflows', workflow_views.WorkflowViewSet, 'workflows'),
+    ('analytics', views.AnalyticsDashboardViewSet, 'analytics'),
+    ('smart-agents', views.SmartAgentViewSet, 'smart-agents'),
+    ('multimodal', views.MultiModalProcessorViewSet, 'multimodal'),
+    ('automation', views.AutomationViewSet, 'automation'),
+    ('performance', views.PerformanceViewSet, 'performance'),
+    ('memory', views.AgentMemoryViewSet, 'memory'),
+    ('groq', views.GroqIntegrationView, 'groq'),
+)
+
+# basename -> (select_related, prefetch_related); see urls_core.PREFETCH_MAP
+PREFETCH_MAP = {
+    'performance': (('agent',), ()),
+    'memory': (('agent',), ()),
+}
+
+router = AutoPrefetchRouter(prefetch_map=PREFETCH_MAP, trailing_slash=True)
+for prefix, viewset, basename in ROUTES:
+    if basename in CACHE_TTLS:
+        viewset = cache_viewset(viewset, CACHE_TTLS[basename])
+    router.register(prefix, viewset, basename=basename)
+
+# Materialize the generated routes once
+_ROUTER_URLS = tuple(router.urls)
+
+urlpatterns = index_by_prefix(router.registry, _ROUTER_URLS)
@@ -0,0 +1,32 @@
+"""
+Core agent endpoints: the low-latency message/session/task/agent routes.
+Mounted under api/ by agents.urls.
+"""
+
+from . import views
+from .url_utils import AutoPrefetchRouter, index_by_prefix
+
+# (prefix, viewset, basename) in descending expected request rate (see agents.urls)
+ROUTES = (
+    ('messages', views.MessageViewSet, 'message'),
+    ('sessions', views.SessionViewSet, 'session'),
+    ('tasks', views.TaskViewSet, 'task'),
+    ('agents', views.AgentViewSet, 'agent'),
+)
+
+# basename -> (select_related, prefetch_related) for the relations each
+# serializer reads, applied to the viewset's get_queryset() by the router.
+# MessageViewSet narrows its own columns with only(), see views.MESSAGE_FIELDS
+PREFETCH_MAP = {
+    'session': ((), ('agents',)),
+    'task': (('assigned_agent',), ('subtasks',)),
+}
+
+router = AutoPrefetchRouter(prefetch_map=PREFETCH_MAP, trailing_slash=True)
+for prefix, viewset, basename in ROUTES:
+    router.register(prefix, viewset, basename=basename)
+
+# Materialize the generated routes once
+_ROUTER_URLS = tuple(router.urls)
+
+urlpatterns = index_by_prefix(router.registry, _ROUTER_URLS)
@@ -1,25 +1,41 @@
-from rest_framework import viewsets, status
+from rest_framework import serializers, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.exceptions import ValidationError, NotFound
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.utils.encoders import JSONEncoder
 from django.conf import settings
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
-from django.http import JsonResponse
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.utils import timezone
-from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
 from asgiref.sync import async_to_sync
-import json
+from backend.parsers import ORJSONParser
+from backend.viewsets import AsyncViewSet
+import orjson
 import asyncio
-from datetime import datetime, timedelta
+import hashlib
+import logging
+import time
+import uuid
+from collections import defaultdict
+from functools import lru_cache
+from datetime import timedelta
 
 # Get the custom user model
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
 from .models import (
     Agent, Session, Task, Message, AgentMemory, 
     PerformanceMetric, AgentStatus, TaskStatus,
@@ -29,20 +45,108 @@ from .serializers import (
     AgentSerializer, SessionSerializer, TaskSerializer,
     MessageSerializer, AgentMemorySerializer, PerformanceMetricSerializer
 )
-from .services.agent_coordinator import AgentCoordinator
 from .services.groq_service import GroqService
 from .services.agent_selector import SmartAgentSelector
 from .services.performance_tracker import PerformanceTracker
-from .services.workflow_engine import WorkflowEngine
-from .services.multimodal_processor import MultiModalProcessor
 from .services.analytics_dashboard import AnalyticsDashboard
 
-class AgentViewSet(viewsets.ModelViewSet):
+from .signals import workflow_templates_cache_key
+from .ws import ws_send_many
+from .tasks import (
+    process_message_task, execute_task_task, process_multimodal_task, stream_completion_task,
+    run_workflow
+)
+
+# MultiModalProcessor pulls in OpenCV, Pillow, speech and OCR bindings. It is
+# imported where it is used so loading the URLConf, manage.py commands and
+# cold workers don't pay for it until a request actually needs it. The
+# AgentCoordinator only runs on Celery workers (see agents.tasks).
+
+# Open access while developing, authenticated otherwise. A tuple, since every
+# viewset shares it and DRF only iterates it.
+_DEFAULT_PERMS = (AllowAny,) if settings.DEBUG else (IsAuthenticated,)
+
+# Shared service instances. DRF builds a new view per request, so creating
+# these in a view's __init__ repeated their setup on every call.
+_AGENT_SELECTOR = SmartAgentSelector()
+_PERF_TRACKER = PerformanceTracker()
+
+
+@lru_cache(maxsize=None)
+def _multimodal_processor():
+    """One MultiModalProcessor per process, built on first use (it loads models)"""
+    from .services.multimodal_processor import MultiModalProcessor
+
+    return MultiModalProcessor()
+
+
+@lru_cache(maxsize=None)
+def _analytics_dashboard():
+    """One AnalyticsDashboard per process"""
+    return AnalyticsDashboard()
+
+# Columns MessageSerializer reads, including the related names it displays;
+# list querysets select_related() these relations and load nothing else
+MESSAGE_RELATED = ('sender', 'sender_agent', 'recipient_agent')
+MESSAGE_FIELDS = (
+    'id', 'session', 'content', 'message_type', 'metadata', 'created_at',
+    'processed_at', 'file_attachment',
+    'sender__username', 'sender_agent__name', 'recipient_agent__name',
+)
+
+# Formats datetimes from values() rows the way the serializers' DateTimeFields do
+_format_datetime = serializers.DateTimeField().to_representation
+
+# Fallback for values orjson can't encode natively (Decimal, timedelta, numpy
+# scalars, lazy strings), converted the same way DRF's JSONRenderer does
+_json_default = JSONEncoder().default
+
+_default_user_id = None
+
+
+def _get_default_user_id():
+    """Id of the shared development user, created on first use and then cached"""
+    global _default_user_id
+    if _default_user_id is None:
+        # Note: CustomUser uses email as USERNAME_FIELD
+        user, _ = User.objects.get_or_create(
+            email='default@example.com',
+            defaults={
+                'username': 'default_user',
+                'first_name': 'Default',
+                'last_name': 'User'
+            }
+        )
+        _default_user_id = user.pk
+    return _default_user_id
+
+
+class GroupNotifyMixin:
+    """
+    Buffer channel-layer group messages raised while handling a request and
+    send them as one batch once the response is finalized, rather than
+    making a blocking round trip per notification.
+    """
+
+    def notify_group(self, group, message):
+        self.__dict__.setdefault('_pending_group_messages', []).append((group, message))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        pending = self.__dict__.pop('_pending_group_messages', None)
+        if pending:
+            ws_send_many(pending)
+        return response
+
+
+class AgentViewSet(GroupNotifyMixin, viewsets.ModelViewSet):
     serializer_class = AgentSerializer
-    permission_classes = [AllowAny] if settings.DEBUG else [IsAuthenticated]
+    permission_classes = _DEFAULT_PERMS
     # Use standard 'pk' lookup_field (model's primary key is UUID 'id') and map URL kwarg 'id'
     lookup_field = 'pk'
     lookup_url_kwarg = 'id'
+    # URL kwargs that may carry the primary key, in order of preference
+    _LOOKUP_KEYS = ('id', 'pk')
     
     def get_queryset(self):
         if settings.DEBUG:
@@ -50,92 +154,16 @@ class AgentViewSet(viewsets.ModelViewSet):
         return Agent.objects.filter(owner=self.request.user)
 
     def get_object(self):
-        """Custom object retrieval with verbose diagnostics in DEBUG.
-
-        We are seeing a 404 despite the UUID appearing in the list endpoint. This override
-        bypasses any potential queryset filtering quirks and surfaces detailed context.
-        """
+        """Single primary-key lookup, scoped to the owner outside DEBUG."""
         # DRF will populate kwargs with lookup_url_kwarg ('id') so fetch that first, fallback to pk
-        pk = self.kwargs.get(self.lookup_url_kwarg) or self.kwargs.get('pk') or self.kwargs.get('id')
-        debug_mode = settings.DEBUG
-        if debug_mode:
-            print("[AgentViewSet.get_object] Incoming lookup:")
-            print(f"  lookup_field attr: {self.lookup_field}")
-            print(f"  kwargs keys: {list(self.kwargs.keys())}")
-            print(f"  raw pk value: {pk}")
-            print(f"  pk repr: {repr(pk)} length={len(str(pk))} type={type(pk)}")
+        pk = next((self.kwargs[key] for key in self._LOOKUP_KEYS if key in self.kwargs), None)
         if not pk:
             raise NotFound("No primary key provided")
-        base_qs = Agent.objects.all()
-        if debug_mode:
-            try:
-                total = base_qs.count()
-                sample_ids = list(base_qs.values_list('id', flat=True)[:5])
-            except Exception as e:
-                total = f"error: {e}"
-                sample_ids = []
-            print(f"  Total agents in DB: {total}")
-            print(f"  Sample first 5 IDs: {sample_ids}")
-            # Direct existence via any() materialization to surface anomalies
-            materialized = list(base_qs.values_list('id', flat=True))
-            direct_membership = pk in [str(x) for x in materialized]
-            print(f"  Direct membership check (materialized list) => {direct_membership}")
-        # Try direct string filter and UUID cast filter
-        exists_global = base_qs.filter(id=pk).exists()
-        if debug_mode:
-            print(f"  ORM filter existence check: {exists_global}")
-            if not exists_global:
-                # Try coercing to UUID explicitly
-                import uuid as _uuid
-                try:
-                    uuid_obj = _uuid.UUID(str(pk))
-                    exists_uuid = base_qs.filter(id=uuid_obj).exists()
-                except Exception as e:
-                    exists_uuid = f"error converting to UUID: {e}"
-                print(f"  Existence with coerced UUID object: {exists_uuid}")
-                # Extra diagnostics: show filter values fetched via IN query
-                try:
-                    probe = list(base_qs.filter(id__in=[pk]).values_list('id', flat=True))
-                    print(f"  Probe filter(id__in=[pk]) returned: {probe}")
-                except Exception as e:
-                    print(f"  Probe filter error: {e}")
-                # Manual fallback if membership is True
-                if 'direct_membership' in locals() and direct_membership:
-                    print("  Anomaly detected: membership True but ORM filter False. Using manual scan fallback.")
-                    for obj in base_qs:
-                        if str(obj.id) == str(pk):
-                            print("  Manual scan located agent; returning fallback instance.")
-                            return obj
-        if not exists_global:
-            if debug_mode:
-                raise NotFound(detail={
-                    'detail': 'Agent not found in global queryset',
-                    'id': pk,
-                    'debug': {
-                        'global_exists': exists_global,
-                        'query_example': f"Agent.objects.filter(id='{pk}')"
-                    }
-                })
+        agent = self.get_queryset().filter(pk=pk).first()
+        if agent is None:
             raise NotFound('No Agent matches the given query.')
-        # Ownership filter only if not debug
-        if not debug_mode:
-            owned_qs = base_qs.filter(id=pk, owner=self.request.user)
-            if not owned_qs.exists():
-                raise NotFound('No Agent matches the given query for this user.')
-            return owned_qs.first()
-        if debug_mode:
-            print("  Fetching instance via get(id=pk)...")
-        try:
-            return base_qs.get(id=pk)
-        except Exception as e:
-            if debug_mode:
-                print(f"  Direct get(id=pk) failed: {e}")
-                # Manual fallback scan (already materialized earlier)
-                for obj in base_qs:
-                    if str(obj.id) == str(pk):
-                        print("  Fallback linear scan matched object.")
-                        return obj
-            raise
+        self.check_object_permissions(self.request, agent)
+        return agent
 
     # Diagnostic override to understand why detail lookup returns 404
     def retrieve(self, request, *args, **kwargs):
@@ -146,7 +174,7 @@ class AgentViewSet(viewsets.ModelViewSet):
             data['_diagnostic'] = {
                 'id': str(instance.id),
                 'status': instance.status,
-                'owner': getattr(instance.owner, 'id', None)
+                'owner': instance.owner_id
             }
             return Response(data)
         return Response(serializer.data)
@@ -155,35 +183,16 @@ class AgentViewSet(viewsets.ModelViewSet):
         if not settings.DEBUG and self.request.user.is_authenticated:
             serializer.save(owner=self.request.user)
         else:
-            # For development without auth, use first user or create default user
-            # Note: CustomUser uses email as USERNAME_FIELD
-            default_user, _ = User.objects.get_or_create(
-                email='default@example.com',
-                defaults={
-                    'username': 'default_user',
-                    'first_name': 'Default',
-                    'last_name': 'User'
-                }
-            )
-            serializer.save(owner=default_user)
+            # For development without auth, use the default user
+            serializer.save(owner_id=_get_default_user_id())
     
     @action(detail=True, methods=['post'])
     def activate(self, request, pk=None, **kwargs):
         agent = self.get_object()
         agent.status = AgentStatus.ACTIVE
-        agent.save()
+        agent.save(update_fields=['status', 'updated_at'])
         
-        # Notify via WebSocket
-        channel_layer = get_channel_layer()
-        user_id = request.user.id if request.user.is_authenticated else 'default'
-        async_to_sync(channel_layer.group_send)(
-            f"user_{user_id}",
-            {
-                "type": "agent_status_update",
-                "agent_id": str(agent.id),
-                "status": agent.status
-            }
-        )
+        self._notify_status(request, agent)
         
         return Response({'status': 'Agent activated'})
     
@@ -191,10 +200,24 @@ class AgentViewSet(viewsets.ModelViewSet):
     def deactivate(self, request, pk=None, **kwargs):
         agent = self.get_object()
         agent.status = AgentStatus.IDLE
-        agent.save()
+        agent.save(update_fields=['status', 'updated_at'])
+        
+        self._notify_status(request, agent)
         
         return Response({'status': 'Agent deactivated'})
     
+    def _notify_status(self, request, agent):
+        """Notify the user's WebSocket group of an agent status change"""
+        user_id = request.user.id if request.user.is_authenticated else 'default'
+        self.notify_group(
+            f"user_{user_id}",
+            {
+                "type": "agent_status_update",
+                "agent_id": str(agent.id),
+                "status": agent.status
+            }
+        )
+    
     @action(detail=True, methods=['get'])
     def performance(self, request, pk=None, **kwargs):
         agent = self.get_object()
@@ -207,21 +230,20 @@ class AgentViewSet(viewsets.ModelViewSet):
         """Direct lookup bypassing get_object for debugging purposes."""
         info = {"requested_id": agent_id}
         try:
-            exists = Agent.objects.filter(id=agent_id).exists()
-            info["exists"] = exists
-            if exists:
-                agent = Agent.objects.get(id=agent_id)
-                info["name"] = agent.name
-                info["status"] = agent.status
-                return Response(info)
-            return Response(info, status=404)
+            agent = Agent.objects.filter(id=agent_id).only('id', 'name', 'status').first()
+            info["exists"] = agent is not None
+            if agent is None:
+                return Response(info, status=404)
+            info["name"] = agent.name
+            info["status"] = agent.status
+            return Response(info)
         except Exception as e:
             info["error"] = str(e)
             return Response(info, status=500)
 
-class SessionViewSet(viewsets.ModelViewSet):
+class SessionViewSet(GroupNotifyMixin, viewsets.ModelViewSet):
     serializer_class = SessionSerializer
-    permission_classes = [AllowAny] if settings.DEBUG else [IsAuthenticated]
+    permission_classes = _DEFAULT_PERMS
     
     def get_queryset(self):
         if settings.DEBUG:
@@ -231,57 +253,47 @@ class SessionViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         # Always ensure we have a valid user
         if self.request.user.is_authenticated:
-            user = self.request.user
-            print(f"DEBUG: Using authenticated user: {user.email} (ID: {user.pk})")
+            user_id = self.request.user.pk
         else:
-            # For development without auth, use first user or create default user
-            # Note: CustomUser uses email as USERNAME_FIELD
-            user, created = User.objects.get_or_create(
-                email='default@example.com',
-                defaults={
-                    'username': 'default_user',
-                    'first_name': 'Default',
-                    'last_name': 'User'
-                }
-            )
-            print(f"DEBUG: Using default user: {user.email} (ID: {user.pk}, Created: {created})")
+            # For development without auth, use the default user
+            user_id = _get_default_user_id()
         
-        # Verify user exists and has valid ID
-        if not user or not user.pk:
-            print(f"ERROR: Invalid user - user={user}, pk={user.pk if user else None}")
+        # Verify we have a valid user ID
+        if not user_id:
+            logger.error("Invalid user for session create: pk=%s", user_id)
             raise ValidationError({'user': 'Valid user is required to create a session'})
         
-        print(f"DEBUG: About to save session with user_id={user.pk}")
         try:
-            session = serializer.save(user=user)
-            print(f"DEBUG: Session created successfully: {session.id}")
-        except Exception as e:
-            print(f"ERROR: Failed to save session: {e}")
-            import traceback
-            traceback.print_exc()
+            session = serializer.save(user_id=user_id)
+        except Exception:
+            logger.exception("Failed to save session for user %s", user_id)
             raise
+        logger.debug("Session %s created for user %s", session.id, user_id)
     
     @action(detail=True, methods=['post'])
     def add_agent(self, request, pk=None):
         session = self.get_object()
         agent_id = request.data.get('agent_id')
         
-        try:
-            if settings.DEBUG:
-                agent = Agent.objects.get(id=agent_id)
-            else:
-                agent = Agent.objects.get(id=agent_id, owner=request.user)
-            session.agents.add(agent)
-            return Response({'status': 'Agent added to session'})
-        except Agent.DoesNotExist:
+        agents = Agent.objects.filter(id=agent_id)
+        if not settings.DEBUG:
+            agents = agents.filter(owner=request.user)
+        if not agents.exists():
             return Response({'error': 'Agent not found'}, status=status.HTTP_404_NOT_FOUND)
+        # One INSERT on the through table; an existing link is left as is,
+        # without add()'s SELECT for duplicates first
+        SessionAgent = Session.agents.through
+        SessionAgent.objects.bulk_create(
+            [SessionAgent(session_id=session.id, agent_id=agent_id)],
+            ignore_conflicts=True
+        )
+        return Response({'status': 'Agent added to session'})
 
     def destroy(self, request, *args, **kwargs):
         session = self.get_object()
         session_id = str(session.id)
         self.perform_destroy(session)
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
+        self.notify_group(
             f"session_{session_id}",
             {
                 "type": "session_deleted",
@@ -296,39 +308,30 @@ class SessionViewSet(viewsets.ModelViewSet):
         content = request.data.get('content')
         message_type = request.data.get('type', 'text')
         
-        # Get user for message
-        user = request.user if request.user.is_authenticated else None
-        if not user and settings.DEBUG:
-            # Note: CustomUser uses email as USERNAME_FIELD
-            user, _ = User.objects.get_or_create(
-                email='default@example.com',
-                defaults={
-                    'username': 'default_user',
-                    'first_name': 'Default',
-                    'last_name': 'User'
-                }
-            )
-        
-        # Create message
-        message = Message.objects.create(
+        message = Message(
             session=session,
-            sender=user,
             content=content,
             message_type=message_type,
             metadata=request.data.get('metadata', {})
         )
+        # Reuse the authenticated user instance so the serializer's sender_name
+        # doesn't re-fetch it; the development default user is set by id only
+        if request.user.is_authenticated:
+            message.sender = request.user
+        elif settings.DEBUG:
+            message.sender_id = _get_default_user_id()
+        message.save(force_insert=True)
         
-        # Process message with agents
-        coordinator = AgentCoordinator(session)
-        coordinator.process_message(message)
+        # Agents reply over the session's WebSocket group once a worker picks this up
+        transaction.on_commit(lambda: process_message_task.delay(str(message.id)), robust=True)
         
         serializer = MessageSerializer(message)
-        return Response(serializer.data)
+        return Response({**serializer.data, 'status': 'queued'}, status=status.HTTP_202_ACCEPTED)
     
     @action(detail=True, methods=['get'])
     def messages(self, request, pk=None):
         session = self.get_object()
-        messages = session.messages.all().order_by('created_at')
+        messages = session.messages.select_related(*MESSAGE_RELATED).only(*MESSAGE_FIELDS).order_by('created_at')
         serializer = MessageSerializer(messages, many=True)
         return Response(serializer.data)
 
@@ -347,15 +350,14 @@ class TaskViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Task is not in pending state'}, status=status.HTTP_400_BAD_REQUEST)
         
         task.status = TaskStatus.IN_PROGRESS
-        task.started_at = datetime.now()
-        task.save()
+        task.started_at = timezone.now()
+        task.save(update_fields=['status', 'started_at'])
         
         # Execute task asynchronously
-        coordinator = AgentCoordinator(task.session)
-        coordinator.execute_task(task)
+        transaction.on_commit(lambda: execute_task_task.delay(str(task.id)), robust=True)
         
         serializer = self.get_serializer(task)
-        return Response(serializer.data)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
     
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
@@ -365,22 +367,23 @@ class TaskViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Task cannot be cancelled'}, status=status.HTTP_400_BAD_REQUEST)
         
         task.status = TaskStatus.CANCELLED
-        task.save()
+        task.save(update_fields=['status'])
         
         return Response({'status': 'Task cancelled'})
 
 class MessageViewSet(viewsets.ModelViewSet):
     serializer_class = MessageSerializer
-    permission_classes = [AllowAny] if settings.DEBUG else [IsAuthenticated]
+    permission_classes = _DEFAULT_PERMS
     
     def get_queryset(self):
+        messages = Message.objects.select_related(*MESSAGE_RELATED).only(*MESSAGE_FIELDS)
         if settings.DEBUG:
             # In debug mode, allow filtering by session parameter
             session_id = self.request.query_params.get('session')
             if session_id:
-                return Message.objects.filter(session_id=session_id)
-            return Message.objects.all()
-        return Message.objects.filter(session__user=self.request.user)
+                return messages.filter(session_id=session_id)
+            return messages
+        return messages.filter(session__user=self.request.user)
     
     def perform_create(self, serializer):
         session_id = self.request.data.get('session_id')
@@ -391,62 +394,44 @@ class MessageViewSet(viewsets.ModelViewSet):
         try:
             if settings.DEBUG:
                 session = Session.objects.get(id=session_id)
-                # Use default user in debug mode
-                # Note: CustomUser uses email as USERNAME_FIELD
-                default_user, _ = User.objects.get_or_create(
-                    email='default@example.com',
-                    defaults={
-                        'username': 'default_user',
-                        'first_name': 'Default',
-                        'last_name': 'User'
-                    }
-                )
-                message = serializer.save(session=session, sender=default_user)
-                
-                # Process message with agent response in debug mode
-                self.process_with_agent(message)
-                
             else:
                 session = Session.objects.get(id=session_id, user=self.request.user)
-                message = serializer.save(session=session, sender=self.request.user)
-                
-                # Process message with agent response
-                self.process_with_agent(message)
-                
         except Session.DoesNotExist:
             raise ValidationError({'session_id': 'Invalid session ID.'})
+        
+        message = Message(session=session, **serializer.validated_data)
+        if settings.DEBUG:
+            # Use default user in debug mode
+            message.sender_id = _get_default_user_id()
+        else:
+            message.sender = self.request.user
+        
+        # Insert the message and the agent's reply in a single statement
+        Message.objects.bulk_create([message, self.process_with_agent(message)])
+        serializer.instance = message
             
     def process_with_agent(self, user_message):
-        """Process user message and generate agent response"""
-        try:
-            print(f"🚀 Processing message: {user_message.content}")
-            
-            # For now, create agent response without sender_agent field
-            # to avoid Agent instance complications
-            response_content = f"Hello! I received your message: '{user_message.content}'. This is an HTTP API response from the Django backend. Your message was processed successfully!"
-            
-            # Create agent response message (without sender_agent for now)
-            agent_response = Message.objects.create(
-                session=user_message.session,
-                sender=user_message.sender,
-                content=response_content,
-                message_type='text',
-                metadata={
-                    'response_to': str(user_message.id),  # Convert UUID to string
-                    'via': 'http_api',
-                    'is_agent_response': True,
-                    'agent_name': 'HTTP API Agent'
-                }
-            )
-            
-            print(f"✅ Created agent response: ID={agent_response.id}, Content={response_content[:50]}...")
-            return agent_response
-            
-        except Exception as e:
-            print(f"❌ Failed to create agent response: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+        """Build the (unsaved) agent response to a user message"""
+        logger.debug("Processing message %s", user_message.id)
+        
+        # For now, create agent response without sender_agent field
+        # to avoid Agent instance complications
+        response_content = f"Hello! I received your message: '{user_message.content}'. This is an HTTP API response from the Django backend. Your message was processed successfully!"
+        
+        # Create agent response message (without sender_agent for now)
+        agent_response = Message(
+            session=user_message.session,
+            sender_id=user_message.sender_id,
+            content=response_content,
+            message_type='text',
+            metadata={
+                'response_to': str(user_message.id),  # Convert UUID to string
+                'via': 'http_api',
+                'is_agent_response': True,
+                'agent_name': 'HTTP API Agent'
+            }
+        )
+        return agent_response
     
     @action(detail=False, methods=['post'])
     def process_multimodal(self, request):
@@ -456,14 +441,12 @@ class MessageViewSet(viewsets.ModelViewSet):
         file_attachment = request.FILES.get('file')
         message_type = request.data.get('type', 'text')
         
-        try:
-            session = Session.objects.get(id=session_id, user=request.user)
-        except Session.DoesNotExist:
+        if not Session.objects.filter(id=session_id, user=request.user).exists():
             return Response({'error': 'Session not found'}, status=status.HTTP_404_NOT_FOUND)
         
         # Create message
         message = Message.objects.create(
-            session=session,
+            session_id=session_id,
             sender=request.user,
             content=content,
             message_type=message_type,
@@ -471,18 +454,17 @@ class MessageViewSet(viewsets.ModelViewSet):
             metadata=request.data.get('metadata', {})
         )
         
-        # Process with appropriate agent
-        coordinator = AgentCoordinator(session)
-        response = coordinator.process_multimodal_message(message)
+        # The result is pushed to the session's WebSocket group as an agent_response
+        transaction.on_commit(lambda: process_multimodal_task.delay(str(message.id)), robust=True)
         
         return Response({
             'message': MessageSerializer(message).data,
-            'response': response
-        })
+            'status': 'queued'
+        }, status=status.HTTP_202_ACCEPTED)
 
 class PerformanceViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = PerformanceMetricSerializer
-    permission_classes = [AllowAny] if settings.DEBUG else [IsAuthenticated]
+    permission_classes = _DEFAULT_PERMS
     
     def get_queryset(self):
         if settings.DEBUG:
@@ -492,55 +474,86 @@ class PerformanceViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'], url_path='agent/(?P<agent_id>[^/.]+)')
     def agent_performance(self, request, agent_id=None):
         """Get performance metrics for a specific agent"""
-        try:
-            if settings.DEBUG:
-                agent = Agent.objects.get(id=agent_id)
-            else:
-                agent = Agent.objects.get(id=agent_id, owner=request.user)
-            
-            metrics = PerformanceMetric.objects.filter(agent=agent).order_by('-timestamp')[:100]
-            
-            # If no metrics exist, create mock data for development
-            if not metrics.exists() and settings.DEBUG:
-                mock_metrics = {
-                    'agent_id': str(agent.id),
-                    'agent_name': agent.name,
-                    'status': agent.status,
-                    'response_time_avg': 250,
-                    'success_rate': 95.5,
-                    'tasks_completed': 42,
-                    'uptime': '99.2%'
-                }
-                return Response(mock_metrics)
-            
-            serializer = PerformanceMetricSerializer(metrics, many=True)
-            return Response({
-                'agent_id': str(agent.id),
-                'agent_name': agent.name,
-                'status': agent.status,
-                'metrics': serializer.data
-            })
-            
-        except Agent.DoesNotExist:
+        # Metrics are read-heavy and fine to serve up to a minute stale
+        owner_key = 'all' if settings.DEBUG else request.user.pk
+        cache_key = f"agent_perf:{owner_key}:{agent_id}:{int(time.time()) // 60}"
+        payload = cache.get(cache_key)
+        if payload is not None:
+            return Response(payload)
+        
+        agents = Agent.objects.only('id', 'name', 'status')
+        if not settings.DEBUG:
+            agents = agents.filter(owner=request.user)
+        agent = agents.filter(id=agent_id).first()
+        if agent is None:
             return Response({'error': 'Agent not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        metrics = list(PerformanceMetric.objects.filter(agent_id=agent.id).order_by('-timestamp')[:100])
+        
+        payload = {
+            'agent_id': str(agent.id),
+            'agent_name': agent.name,
+            'status': agent.status,
+        }
+        if not metrics and settings.DEBUG:
+            # If no metrics exist, return mock data for development
+            payload.update({
+                'response_time_avg': 250,
+                'success_rate': 95.5,
+                'tasks_completed': 42,
+                'uptime': '99.2%'
+            })
+        else:
+            for metric in metrics:
+                metric.agent = agent
+            payload['metrics'] = list(PerformanceMetricSerializer(metrics, many=True).data)
+        
+        cache.set(cache_key, payload, 60)
+        return Response(payload)
     
     @action(detail=False, methods=['get'])
     def real_time_metrics(self, request):
         """Get real-time performance metrics for all user's agents"""
+        # Plain rows only: nothing here needs model instances
         if settings.DEBUG:
-            agents = Agent.objects.all()[:20]  # Limit for performance
+            agents = Agent.objects.values('id', 'name', 'status')[:20]  # Limit for performance
         else:
-            agents = Agent.objects.filter(owner=request.user)
+            agents = Agent.objects.filter(owner_id=request.user.id).values('id', 'name', 'status')
             
+        agents = list(agents)
+        
+        # Latest 10 metrics per agent in one query, ranked per agent by a window function
+        latest_metrics = defaultdict(list)
+        ranked = PerformanceMetric.objects.filter(
+            agent_id__in=[agent['id'] for agent in agents]
+        ).annotate(
+            rank=Window(RowNumber(), partition_by=[F('agent_id')], order_by=F('timestamp').desc())
+        ).filter(rank__lte=10).order_by('agent_id', '-timestamp').values(
+            'id', 'agent_id', 'metric_name', 'metric_value', 'timestamp', 'metadata'
+        )
+        for metric in ranked:
+            latest_metrics[metric['agent_id']].append(metric)
+        
         metrics_data = []
         
         for agent in agents:
-            latest_metrics = PerformanceMetric.objects.filter(agent=agent).order_by('-timestamp')[:10]
+            # Same shape as PerformanceMetricSerializer
+            metrics = [
+                {
+                    'id': str(metric['id']),
+                    'metric_name': metric['metric_name'],
+                    'metric_value': metric['metric_value'],
+                    'timestamp': _format_datetime(metric['timestamp']),
+                    'metadata': metric['metadata'],
+                    'agent_name': agent['name']
+                }
+                for metric in latest_metrics.get(agent['id'], [])
+            ]
             agent_data = {
-                'agent_id': str(agent.id),
-                'agent_name': agent.name,
-                'status': agent.status,
-                'metrics': PerformanceMetricSerializer(latest_metrics, many=True).data if latest_metrics.exists() else []
+                'agent_id': str(agent['id']),
+                'agent_name': agent['name'],
+                'status': agent['status'],
+                'metrics': metrics
             }
             metrics_data.append(agent_data)
         
@@ -566,27 +579,13 @@ class GroqIntegrationView(viewsets.ViewSet):
         messages = request.data.get('messages', [])
         session_id = request.data.get('session_id')
         
-        try:
-            session = Session.objects.get(id=session_id, user=request.user)
-        except Session.DoesNotExist:
+        if not Session.objects.filter(id=session_id, user=request.user).exists():
             return Response({'error': 'Session not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        groq_service = GroqService()
+        # Tokens are forwarded to the session's WebSocket group by a worker
+        stream_completion_task.delay(messages, str(session_id), request.data.get('model'))
         
-        # Start streaming response
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f"session_{session_id}",
-            {
-                "type": "stream_start",
-                "message": "Starting stream..."
-            }
-        )
-        
-        # This would be handled asynchronously in a real implementation
-        response = groq_service.stream_completion(messages, session_id)
-        
-        return Response({'status': 'Stream started'})
+        return Response({'status': 'Stream started'}, status=status.HTTP_202_ACCEPTED)
 
 class AgentMemoryViewSet(viewsets.ModelViewSet):
     serializer_class = AgentMemorySerializer
@@ -604,21 +603,22 @@ class AgentMemoryViewSet(viewsets.ModelViewSet):
         value = request.data.get('value')
         importance_score = request.data.get('importance_score', 1.0)
         
-        try:
-            agent = Agent.objects.get(id=agent_id, owner=request.user)
-            session = Session.objects.get(id=session_id, user=request.user)
-        except (Agent.DoesNotExist, Session.DoesNotExist):
+        # Ownership checks only; the serializer needs nothing from the session
+        # and just the agent's name
+        agent = Agent.objects.filter(id=agent_id, owner=request.user).only('id', 'name').first()
+        if agent is None or not Session.objects.filter(id=session_id, user=request.user).exists():
             return Response({'error': 'Agent or Session not found'}, status=status.HTTP_404_NOT_FOUND)
         
         memory, created = AgentMemory.objects.update_or_create(
-            agent=agent,
-            session=session,
+            agent_id=agent.id,
+            session_id=session_id,
             key=key,
             defaults={
                 'value': value,
                 'importance_score': importance_score
             }
         )
+        memory.agent = agent
         
         serializer = self.get_serializer(memory)
         return Response(serializer.data)
@@ -646,12 +646,7 @@ class AgentMemoryViewSet(viewsets.ModelViewSet):
 class SmartAgentViewSet(viewsets.ViewSet):
     """Enhanced agent management with smart selection and performance tracking."""
     
-    permission_classes = [AllowAny] if settings.DEBUG else [IsAuthenticated]
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.agent_selector = SmartAgentSelector()
-        self.performance_tracker = PerformanceTracker()
+    permission_classes = _DEFAULT_PERMS
     
     @action(detail=False, methods=['post'])
     def select_best_agent(self, request):
@@ -667,14 +662,14 @@ class SmartAgentViewSet(viewsets.ViewSet):
             )
         
         try:
-            agent = self.agent_selector.select_best_agent(
+            agent = _AGENT_SELECTOR.select_best_agent(
                 task_type=task_type,
                 task_description=task_description,
                 requirements=requirements
             )
             
             if agent:
-                explanation = self.agent_selector.explain_selection(
+                explanation = _AGENT_SELECTOR.explain_selection(
                     agent, task_type, task_description, requirements
                 )
                 
@@ -708,7 +703,7 @@ class SmartAgentViewSet(viewsets.ViewSet):
             )
         
         try:
-            recommendations = self.agent_selector.get_agent_recommendations(
+            recommendations = _AGENT_SELECTOR.get_agent_recommendations(
                 task_type=task_type,
                 task_description=task_description,
                 count=count
@@ -737,12 +732,12 @@ class SmartAgentViewSet(viewsets.ViewSet):
             agent = get_object_or_404(Agent, pk=pk)
             days = int(request.query_params.get('days', 30))
             
-            performance_data = self.performance_tracker.get_agent_performance(
+            performance_data = _PERF_TRACKER.get_agent_performance(
                 agent_id=str(agent.id),
                 days=days
             )
             
-            recommendations = self.performance_tracker.get_performance_recommendations(
+            recommendations = _PERF_TRACKER.get_performance_recommendations(
                 agent_id=str(agent.id)
             )
             
@@ -760,14 +755,33 @@ class SmartAgentViewSet(viewsets.ViewSet):
             )
 
 
+# Cache key prefix (and lifetime) mapping a workflow id to its Celery task id
+WORKFLOW_TASK_KEY_PREFIX = 'workflow_task:'
+WORKFLOW_TASK_KEY_TTL = 60 * 60 * 24
+
+
+def _workflow_result(workflow_id, user_id):
+    """AsyncResult of a workflow ``user_id`` queued, or None for unknown ids.
+
+    The cache entry doubles as the index of live workflows: ids that were
+    never queued, whose entry expired, or that belong to another user are
+    turned away with one cache GET before the Celery result backend is touched.
+    """
+    entry = cache.get(f"{WORKFLOW_TASK_KEY_PREFIX}{workflow_id}")
+    if not entry:
+        return None
+    task_id, owner_id = entry
+    return run_workflow.AsyncResult(task_id) if owner_id == user_id else None
+
+
+def _workflow_user_id(request):
+    return str(request.user.id) if request.user.is_authenticated else 'default'
+
+
 class WorkflowViewSet(viewsets.ViewSet):
     """Advanced workflow automation and management."""
     
-    permission_classes = [AllowAny] if settings.DEBUG else [IsAuthenticated]
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.workflow_engine = WorkflowEngine()
+    permission_classes = _DEFAULT_PERMS
     
     @action(detail=False, methods=['post'])
     def execute_workflow(self, request):
@@ -783,18 +797,22 @@ class WorkflowViewSet(viewsets.ViewSet):
             )
         
         try:
-            # Get user ID
-            user_id = str(request.user.id) if request.user.is_authenticated else 'default'
+            user_id = _workflow_user_id(request)
             
-            # Execute workflow asynchronously
-            result = async_to_sync(self.workflow_engine.execute_workflow)(
-                workflow_definition=workflow_definition,
-                input_data=input_data,
-                user_id=user_id,
-                session_id=session_id
+            # The engine runs on a worker; clients poll workflow_status with this
+            # id. It is always generated here so runs can't collide or be guessed.
+            workflow_id = f"workflow_{uuid.uuid4().hex}"
+            workflow_definition = {**workflow_definition, 'id': workflow_id}
+            
+            result = run_workflow.delay(workflow_definition, input_data, user_id, session_id)
+            cache.set(
+                f"{WORKFLOW_TASK_KEY_PREFIX}{workflow_id}", (result.id, user_id), WORKFLOW_TASK_KEY_TTL
             )
             
-            return Response(result)
+            return Response(
+                {'workflow_id': workflow_id, 'status': 'queued'},
+                status=status.HTTP_202_ACCEPTED
+            )
             
         except Exception as e:
             return Response(
@@ -814,15 +832,20 @@ class WorkflowViewSet(viewsets.ViewSet):
             )
         
         try:
-            status_data = self.workflow_engine.get_workflow_status(workflow_id)
+            result = _workflow_result(workflow_id, _workflow_user_id(request))
             
-            if status_data:
-                return Response(status_data)
-            else:
+            if result is None:
                 return Response(
                     {'error': 'Workflow not found'}, 
                     status=status.HTTP_404_NOT_FOUND
                 )
+            
+            status_data = {'workflow_id': workflow_id, 'status': result.state.lower()}
+            if result.successful():
+                status_data['result'] = result.result
+            elif result.failed():
+                status_data['error'] = str(result.result)
+            return Response(status_data)
                 
         except Exception as e:
             return Response(
@@ -842,15 +865,24 @@ class WorkflowViewSet(viewsets.ViewSet):
             )
         
         try:
-            success = self.workflow_engine.cancel_workflow(workflow_id)
+            result = _workflow_result(workflow_id, _workflow_user_id(request))
             
-            if success:
-                return Response({'status': 'Workflow cancelled successfully'})
-            else:
+            if result is None or result.ready():
                 return Response(
                     {'error': 'Workflow not found or already completed'}, 
                     status=status.HTTP_404_NOT_FOUND
                 )
+            
+            # revoke() only drops a task that hasn't started; a running
+            # workflow can't be stopped and will complete
+            if result.state != 'PENDING':
+                return Response(
+                    {'error': 'Workflow is already running and cannot be cancelled'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            
+            result.revoke()
+            return Response({'status': 'Workflow cancelled successfully'})
                 
         except Exception as e:
             return Response(
@@ -862,30 +894,29 @@ class WorkflowViewSet(viewsets.ViewSet):
     def workflow_templates(self, request):
         """Get available workflow templates."""
         try:
-            templates = WorkflowTemplate.objects.filter(is_public=True).order_by('-usage_count')
-            
-            # If user is authenticated, include their private templates
-            if request.user.is_authenticated:
-                user_templates = WorkflowTemplate.objects.filter(
-                    created_by=request.user
-                ).order_by('-updated_at')
-                templates = templates.union(user_templates)
-            
-            template_data = []
-            for template in templates:
-                template_data.append({
-                    'id': str(template.id),
-                    'name': template.name,
-                    'description': template.description,
-                    'category': template.category,
-                    'tags': template.tags,
-                    'usage_count': template.usage_count,
-                    'average_rating': template.average_rating,
-                    'is_public': template.is_public,
-                    'created_at': template.created_at.isoformat()
-                })
+            user_id = request.user.id if request.user.is_authenticated else None
+            cache_key = workflow_templates_cache_key(user_id)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                # Pre-rendered body; skips the queries and DRF's renderer
+                return HttpResponse(cached, content_type='application/json')
+            
+            # Public templates, plus the user's own private ones when signed in
+            visible = Q(is_public=True)
+            if user_id is not None:
+                visible |= Q(created_by_id=user_id)
+            
+            template_data = list(
+                WorkflowTemplate.objects.filter(visible).order_by('-usage_count').values(
+                    'id', 'name', 'description', 'category', 'tags',
+                    'usage_count', 'average_rating', 'is_public', 'created_at'
+                )
+            )
             
-            return Response({'templates': template_data})
+            # orjson writes UUIDs and datetimes (RFC 3339, as isoformat()) itself
+            body = orjson.dumps({'templates': template_data})
+            cache.set(cache_key, body, 60)
+            return HttpResponse(body, content_type='application/json')
             
         except Exception as e:
             return Response(
@@ -894,18 +925,29 @@ class WorkflowViewSet(viewsets.ViewSet):
             )
 
 
-class MultiModalProcessorViewSet(viewsets.ViewSet):
-    """Advanced multi-modal processing capabilities."""
+class MultiModalProcessorViewSet(AsyncViewSet):
+    """Advanced multi-modal processing capabilities.
+
+    The processor's methods are coroutines, so these actions are async and
+    await them directly instead of bridging through async_to_sync().
+    """
     
-    permission_classes = [AllowAny] if settings.DEBUG else [IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    permission_classes = _DEFAULT_PERMS
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser]
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.processor = MultiModalProcessor()
+        self.processor = _multimodal_processor()
+    
+    def initialize_request(self, request, *args, **kwargs):
+        # Stream uploads straight to a temp file instead of buffering them in
+        # memory first. Set before DRF wraps the request, since CSRF checks
+        # during authentication can already parse the body.
+        request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
     
     @action(detail=False, methods=['post'])
-    def process_multimodal(self, request):
+    async def process_multimodal(self, request):
         """Process multi-modal input data."""
         try:
             input_data = {}
@@ -927,7 +969,7 @@ class MultiModalProcessorViewSet(viewsets.ViewSet):
                 )
             
             # Process the multi-modal input
-            result = async_to_sync(self.processor.process_multimodal_input)(
+            result = await self.processor.process_multimodal_input(
                 input_data=input_data,
                 processing_options=processing_options
             )
@@ -941,7 +983,7 @@ class MultiModalProcessorViewSet(viewsets.ViewSet):
             )
     
     @action(detail=False, methods=['post'])
-    def analyze_text(self, request):
+    async def analyze_text(self, request):
         """Analyze text content with AI."""
         text_content = request.data.get('text', '')
         options = request.data.get('options', {})
@@ -953,7 +995,7 @@ class MultiModalProcessorViewSet(viewsets.ViewSet):
             )
         
         try:
-            result = async_to_sync(self.processor._process_text)(
+            result = await self.processor._process_text(
                 text_data=text_content,
                 options=options
             )
@@ -967,7 +1009,7 @@ class MultiModalProcessorViewSet(viewsets.ViewSet):
             )
     
     @action(detail=False, methods=['post'])
-    def analyze_image(self, request):
+    async def analyze_image(self, request):
         """Analyze image content with computer vision."""
         if 'image' not in request.FILES:
             return Response(
@@ -976,11 +1018,20 @@ class MultiModalProcessorViewSet(viewsets.ViewSet):
             )
         
         image_file = request.FILES['image']
-        options = json.loads(request.data.get('options', '{}'))
+        # Multipart forms carry options as a JSON string; JSON bodies are already parsed
+        options = request.data.get('options') or {}
+        if isinstance(options, (str, bytes)):
+            try:
+                options = orjson.loads(options)
+            except orjson.JSONDecodeError:
+                return Response(
+                    {'error': 'options must be valid JSON'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         
         try:
-            result = async_to_sync(self.processor._process_image)(
-                image_data=image_file,
+            result = await self.processor._process_image(
+                image_data=image_file.temporary_file_path(),
                 options=options
             )
             
@@ -996,11 +1047,20 @@ class MultiModalProcessorViewSet(viewsets.ViewSet):
 class AnalyticsDashboardViewSet(viewsets.ViewSet):
     """Advanced analytics and dashboard data."""
     
-    permission_classes = [AllowAny] if settings.DEBUG else [IsAuthenticated]
+    permission_classes = _DEFAULT_PERMS
+    
+    # Aggregations over whole 7d/30d windows; polling clients can read them a few minutes stale
+    DASHBOARD_CACHE_TTL = 300
+    INSIGHTS_CACHE_TTL = 600
+    SYSTEM_PERFORMANCE_CACHE_TTL = 30
+    
+    # These cache for themselves (per user, or shared for system_performance),
+    # so they skip agents.url_utils.cache_viewset's page cache
+    page_cache_exempt = ('dashboard_data', 'insights', 'system_performance')
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.analytics = AnalyticsDashboard()
+        self.analytics = _analytics_dashboard()
     
     @action(detail=False, methods=['get'])
     def dashboard_data(self, request):
@@ -1010,13 +1070,19 @@ class AnalyticsDashboardViewSet(viewsets.ViewSet):
             time_range = request.query_params.get('time_range', '7d')
             include_predictions = request.query_params.get('predictions', 'true').lower() == 'true'
             
-            result = async_to_sync(self.analytics.get_dashboard_data)(
-                user_id=user_id,
-                time_range=time_range,
-                include_predictions=include_predictions
-            )
+            # Cached as encoded JSON, so hits skip both the aggregation and rendering
+            cache_key = f"dash:{user_id or 'anon'}:{time_range}:{int(include_predictions)}"
+            body = cache.get(cache_key)
+            if body is None:
+                result = async_to_sync(self.analytics.get_dashboard_data)(
+                    user_id=user_id,
+                    time_range=time_range,
+                    include_predictions=include_predictions
+                )
+                body = orjson.dumps(result, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+                cache.set(cache_key, body, self.DASHBOARD_CACHE_TTL)
             
-            return Response(result)
+            return HttpResponse(body, content_type='application/json')
             
         except Exception as e:
             return Response(
@@ -1030,9 +1096,20 @@ class AnalyticsDashboardViewSet(viewsets.ViewSet):
         try:
             days = int(request.query_params.get('days', 7))
             
-            performance_data = self.analytics.performance_tracker.get_system_performance(days=days)
-            
-            return Response(performance_data)
+            # Server-wide figures, the same for every caller: one shared entry per window
+            cache_key = f"sysperf:{days}"
+            cached = cache.get(cache_key)
+            if cached is None:
+                performance_data = self.analytics.performance_tracker.get_system_performance(days=days)
+                body = orjson.dumps(performance_data, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+                cached = (body, f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"')
+                cache.set(cache_key, cached, self.SYSTEM_PERFORMANCE_CACHE_TTL)
+            
+            body, etag = cached
+            response = HttpResponse(body, content_type='application/json')
+            response['ETag'] = etag
+            # 304 for pollers that already hold this version
+            return get_conditional_response(request, etag=etag, response=response)
             
         except Exception as e:
             return Response(
@@ -1046,23 +1123,31 @@ class AnalyticsDashboardViewSet(viewsets.ViewSet):
         try:
             user_id = str(request.user.id) if request.user.is_authenticated else None
             days = int(request.query_params.get('days', 30))
+            
+            cache_key = f"insights:{user_id or 'anon'}:{days}"
+            payload = cache.get(cache_key)
+            if payload is not None:
+                return Response(payload)
+            
             since_date = timezone.now() - timedelta(days=days)
             
-            insights = async_to_sync(self.analytics._generate_insights)(
-                user_id=user_id,
-                since_date=since_date
-            )
+            async def _insights_and_recommendations():
+                return await asyncio.gather(
+                    self.analytics._generate_insights(user_id=user_id, since_date=since_date),
+                    self.analytics._get_recommendations(user_id=user_id, since_date=since_date),
+                )
             
-            recommendations = async_to_sync(self.analytics._get_recommendations)(
-                user_id=user_id,
-                since_date=since_date
-            )
+            # One loop hop for both instead of one async_to_sync() bridge each
+            insights, recommendations = async_to_sync(_insights_and_recommendations)()
             
-            return Response({
+            payload = {
                 'insights': insights,
                 'recommendations': recommendations,
                 'generated_at': timezone.now().isoformat()
-            })
+            }
+            cache.set(cache_key, payload, self.INSIGHTS_CACHE_TTL)
+            
+            return Response(payload)
             
         except Exception as e:
             return Response(
@@ -1074,7 +1159,7 @@ class AnalyticsDashboardViewSet(viewsets.ViewSet):
 class AutomationViewSet(viewsets.ViewSet):
     """Automated task management and scheduling."""
     
-    permission_classes = [AllowAny] if settings.DEBUG else [IsAuthenticated]
+    permission_classes = _DEFAULT_PERMS
     
     @action(detail=False, methods=['post'])
     def create_automated_task(self, request):
@@ -1091,27 +1176,23 @@ class AutomationViewSet(viewsets.ViewSet):
                         status=status.HTTP_400_BAD_REQUEST
                     )
             
-            # Get or create session
+            user_id = request.user.pk if request.user.is_authenticated else _get_default_user_id()
+            
+            # Fetch an existing session up front; a new one is only created once an agent is found
             session_id = task_data.get('session_id')
+            session = None
             if session_id:
                 try:
-                    session = Session.objects.get(id=session_id)
+                    # SessionSerializer lists the agents and counts them; one prefetch covers both
+                    session = Session.objects.prefetch_related('agents').get(id=session_id)
                 except Session.DoesNotExist:
                     return Response(
                         {'error': 'Session not found'}, 
                         status=status.HTTP_404_NOT_FOUND
                     )
-            else:
-                # Create new session
-                user = request.user if request.user.is_authenticated else User.objects.get(username='default_user')
-                session = Session.objects.create(
-                    name=f"Auto Session - {task_data['title']}",
-                    user=user
-                )
             
             # Smart agent selection
-            agent_selector = SmartAgentSelector()
-            agent = agent_selector.select_best_agent(
+            agent = _AGENT_SELECTOR.select_best_agent(
                 task_type=task_data['task_type'],
                 task_description=task_data['description'],
                 requirements=task_data.get('requirements', {})
@@ -1123,23 +1204,27 @@ class AutomationViewSet(viewsets.ViewSet):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Create task
-            task = Task.objects.create(
-                title=task_data['title'],
-                description=task_data['description'],
-                task_type=task_data['task_type'],
-                priority=task_data.get('priority', 'normal'),
-                assigned_agent=agent,
-                created_by=request.user if request.user.is_authenticated else User.objects.get(username='default_user'),
-                session=session,
-                requirements=task_data.get('requirements', {}),
-                input_data=task_data.get('input_data', {})
-            )
-            
-            # Start task processing (in a real implementation, this would be queued)
-            task.status = TaskStatus.IN_PROGRESS
-            task.started_at = timezone.now()
-            task.save()
+            with transaction.atomic():
+                if session is None:
+                    session = Session.objects.create(
+                        name=f"Auto Session - {task_data['title']}",
+                        user_id=user_id
+                    )
+                
+                # Starts in progress right away (in a real implementation, this would be queued)
+                task = Task.objects.create(
+                    title=task_data['title'],
+                    description=task_data['description'],
+                    task_type=task_data['task_type'],
+                    priority=task_data.get('priority', 'normal'),
+                    status=TaskStatus.IN_PROGRESS,
+                    started_at=timezone.now(),
+                    assigned_agent=agent,
+                    created_by_id=user_id,
+                    session=session,
+                    requirements=task_data.get('requirements', {}),
+                    input_data=task_data.get('input_data', {})
+                )
             
             return Response({
                 'task': TaskSerializer(task).data,
@@ -1163,32 +1248,28 @@ class AutomationViewSet(viewsets.ViewSet):
             if not user_id:
                 return Response({'suggestions': []})
             
-            # Get user's recent tasks to analyze patterns
-            recent_tasks = Task.objects.filter(
-                created_by_id=user_id,
-                created_at__gte=timezone.now() - timedelta(days=30)
-            ).order_by('-created_at')[:20]
-            
-            # Analyze patterns and generate suggestions
-            suggestions = []
+            now = timezone.now()
             
-            # Most common task types
-            task_types = {}
-            for task in recent_tasks:
-                task_types[task.task_type] = task_types.get(task.task_type, 0) + 1
+            # Most common task types over the last 30 days, counted by the database
+            frequent_types = Task.objects.filter(
+                created_by_id=user_id,
+                created_at__gte=now - timedelta(days=30)
+            ).values('task_type').annotate(count=Count('id')).order_by('-count').values_list('task_type', 'count')[:3]
             
             # Generate suggestions based on patterns
-            for task_type, count in sorted(task_types.items(), key=lambda x: x[1], reverse=True)[:3]:
-                suggestions.append({
+            suggestions = [
+                {
                     'type': 'frequent_task_type',
                     'title': f'Create {task_type} task',
                     'description': f'You\'ve created {count} {task_type} tasks recently. Create another?',
                     'suggested_task_type': task_type,
                     'confidence': min(count / 10.0, 1.0)
-                })
+                }
+                for task_type, count in frequent_types
+            ]
             
             # Time-based suggestions
-            current_hour = timezone.now().hour
+            current_hour = now.hour
             if 9 <= current_hour <= 17:  # Business hours
                 suggestions.append({
                     'type': 'time_based',
@@ -4,36 +4,138 @@ API Views for Workflow Management
 Provides endpoints for creating, executing, and monitoring workflows
 """
 
-from rest_framework import viewsets, status
+from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 import asyncio
+import hashlib
 import logging
+from collections import defaultdict
 
+import orjson
+
+from backend.viewsets import AsyncViewSet
 from .services.workflow_templates import WorkflowTemplates, get_template, WorkflowCategory
-from .services.workflow_orchestrator import WorkflowOrchestrator
+from .services.workflow_orchestrator import TemplateNotFound, get_workflow_orchestrator
 from .models import Session, Agent
+from .tasks import run_workflow_template
 from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 
 logger = logging.getLogger(__name__)
 
 
-class WorkflowViewSet(viewsets.ViewSet):
+def _template_summary(template):
+    """The listing view of a template"""
+    return {
+        'id': template['id'],
+        'name': template['name'],
+        'description': template['description'],
+        'category': template['category'],
+        'step_count': len(template['steps']),
+        'input_schema': template.get('input_schema', {}),
+    }
+
+
+def reload_template_cache():
+    """(Re)build the template listings served by WorkflowViewSet.templates"""
+    global _TEMPLATE_SUMMARIES, _TEMPLATES_BY_CATEGORY
+    
+    summaries = []
+    by_category = defaultdict(list)
+    for template in WorkflowTemplates.get_all_templates().values():
+        summary = _template_summary(template)
+        summaries.append(summary)
+        by_category[summary['category']].append(summary)
+    
+    _TEMPLATE_SUMMARIES = summaries
+    _TEMPLATES_BY_CATEGORY = dict(by_category)
+
+
+# Templates and categories are static, so their listings are built once at import
+_TEMPLATE_SUMMARIES = []
+_TEMPLATES_BY_CATEGORY = {}
+reload_template_cache()
+
+# Pre-rendered, so categories() skips DRF's renderer as well
+_CATEGORIES_BODY = orjson.dumps({
+    'categories': [
+        {
+            'value': cat.value,
+            'name': cat.name.replace('_', ' ').title()
+        }
+        for cat in WorkflowCategory
+    ]
+})
+
+def _workflow_result_key(workflow_id, input_data, user_id, session_id):
+    """Deterministic cache key for a workflow run's inputs"""
+    payload = orjson.dumps(
+        {'w': workflow_id, 'i': input_data, 'u': user_id, 's': session_id},
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        default=str
+    )
+    return f"wf:{hashlib.blake2b(payload, digest_size=16).hexdigest()}"
+
+
+# quick_start use case -> (workflow template id, input field that receives the
+# user's text, remaining input defaults)
+_QUICK_START_MAP = {
+    'analyze_data': ('data_analysis_pipeline', 'data_source', {
+        'analysis_type': 'descriptive',
+        'output_format': 'report'
+    }),
+    'support_ticket': ('customer_support_ticket', 'customer_message', {
+        'priority': 'medium'
+    }),
+    'code_review': ('code_review_process', 'repository', {
+        'branch': 'main'
+    }),
+    'research': ('research_and_summarize', 'research_query', {
+        'depth': 'moderate',
+        'output_format': 'summary'
+    }),
+    'create_content': ('content_creation_workflow', 'topic', {
+        'content_type': 'article',
+        'length': 'medium',
+        'tone': 'professional'
+    }),
+    'fix_bug': ('bug_investigation', 'bug_description', {
+        # A tuple, so requests can't mutate the shared default
+        'steps_to_reproduce': ()
+    }),
+}
+
+# Progress updates closer together than this (seconds) are coalesced
+PROGRESS_FLUSH_INTERVAL = 0.1
+
+# execute_async records each execution id it hands out, so status() can tell
+# real executions from unknown ids
+EXECUTION_KEY_PREFIX = 'workflow_execution:'
+EXECUTION_KEY_TTL = 60 * 60 * 24
+
+
+class WorkflowViewSet(AsyncViewSet):
     """
     ViewSet for managing and executing workflows
+
+    Execution actions are async so a workflow's LLM and channel-layer I/O is
+    awaited on the server's event loop rather than holding a worker thread.
+    Sync actions still work; adrf runs them in a thread.
     """
     permission_classes = [AllowAny] if settings.DEBUG else [IsAuthenticated]
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.orchestrator = WorkflowOrchestrator()
+    @property
+    def orchestrator(self):
+        # Shared per process; DRF builds a new viewset for every request
+        return get_workflow_orchestrator()
     
     @action(detail=False, methods=['get'])
-    def templates(self, request):
+    async def templates(self, request):
         """
         List all available workflow templates
         
@@ -41,66 +143,25 @@ class WorkflowViewSet(viewsets.ViewSet):
         Query params:
         - category: Filter by workflow category
         """
-        try:
-            templates = WorkflowTemplates.get_all_templates()
-            
-            # Filter by category if provided
-            category = request.query_params.get('category')
-            if category:
-                templates = {
-                    k: v for k, v in templates.items()
-                    if v.get('category') == category
-                }
-            
-            # Format for API response
-            template_list = [
-                {
-                    'id': template['id'],
-                    'name': template['name'],
-                    'description': template['description'],
-                    'category': template['category'],
-                    'step_count': len(template['steps']),
-                    'input_schema': template.get('input_schema', {}),
-                }
-                for template in templates.values()
-            ]
-            
-            return Response({
-                'count': len(template_list),
-                'templates': template_list
-            })
-            
-        except Exception as e:
-            logger.error(f"Error fetching templates: {e}")
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        category = request.query_params.get('category')
+        if category:
+            template_list = _TEMPLATES_BY_CATEGORY.get(category, [])
+        else:
+            template_list = _TEMPLATE_SUMMARIES
+        
+        return Response({
+            'count': len(template_list),
+            'templates': template_list
+        })
     
     @action(detail=False, methods=['get'])
-    def categories(self, request):
+    async def categories(self, request):
         """
         List all workflow categories
         
         GET /api/workflows/categories/
         """
-        try:
-            categories = [
-                {
-                    'value': cat.value,
-                    'name': cat.name.replace('_', ' ').title()
-                }
-                for cat in WorkflowCategory
-            ]
-            
-            return Response({'categories': categories})
-            
-        except Exception as e:
-            logger.error(f"Error fetching categories: {e}")
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return HttpResponse(_CATEGORIES_BODY, content_type='application/json')
     
     @action(detail=True, methods=['get'])
     def template_detail(self, request, pk=None):
@@ -118,7 +179,7 @@ class WorkflowViewSet(viewsets.ViewSet):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            return Response(template)
+            return Response(dict(template))
             
         except Exception as e:
             logger.error(f"Error fetching template detail: {e}")
@@ -128,7 +189,7 @@ class WorkflowViewSet(viewsets.ViewSet):
             )
     
     @action(detail=False, methods=['post'])
-    def execute(self, request):
+    async def execute(self, request):
         """
         Execute a workflow
         
@@ -154,30 +215,26 @@ class WorkflowViewSet(viewsets.ViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Validate template exists
-            template = get_template(workflow_id)
-            if not template:
-                return Response(
-                    {'error': f'Workflow template {workflow_id} not found'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            
             # Get user ID
             user_id = request.user.id if request.user.is_authenticated else 1
             
-            # Execute workflow asynchronously
-            result = asyncio.run(
-                self.orchestrator.execute_workflow(
-                    workflow_id=workflow_id,
-                    input_data=input_data,
-                    user_id=user_id,
-                    session_id=session_id,
-                    callback=self._create_progress_callback(session_id)
-                )
+            # The orchestrator validates the template id (TemplateNotFound -> 404)
+            result = await self._execute_cached(
+                request,
+                workflow_id=workflow_id,
+                input_data=input_data,
+                user_id=user_id,
+                session_id=session_id,
+                callback=self._create_progress_callback(session_id)
             )
             
             return Response(result, status=status.HTTP_200_OK)
             
+        except TemplateNotFound as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_404_NOT_FOUND
+            )
         except Exception as e:
             logger.error(f"Error executing workflow: {e}", exc_info=True)
             return Response(
@@ -222,31 +279,11 @@ class WorkflowViewSet(viewsets.ViewSet):
             # Get user ID
             user_id = request.user.id if request.user.is_authenticated else 1
             
-            # Generate execution ID
-            from datetime import datetime
-            execution_id = f"{workflow_id}_{int(datetime.now().timestamp())}"
-            
-            # Start workflow in background
-            # In production, you'd use Celery or similar
-            import threading
-            
-            def run_workflow():
-                try:
-                    asyncio.run(
-                        self.orchestrator.execute_workflow(
-                            workflow_id=workflow_id,
-                            input_data=input_data,
-                            user_id=user_id,
-                            session_id=session_id,
-                            callback=self._create_progress_callback(session_id)
-                        )
-                    )
-                except Exception as e:
-                    logger.error(f"Background workflow execution failed: {e}")
-            
-            thread = threading.Thread(target=run_workflow)
-            thread.daemon = True
-            thread.start()
+            # Runs on a Celery worker; the task id doubles as the execution id
+            execution_id = run_workflow_template.delay(
+                workflow_id, input_data, user_id, session_id
+            ).id
+            cache.set(f"{EXECUTION_KEY_PREFIX}{execution_id}", workflow_id, EXECUTION_KEY_TTL)
             
             return Response({
                 'execution_id': execution_id,
@@ -264,19 +301,30 @@ class WorkflowViewSet(viewsets.ViewSet):
     @action(detail=True, methods=['get'])
     def status(self, request, pk=None):
         """
-        Get status of a workflow execution
+        Get status of a workflow execution started by execute_async
         
         GET /api/workflows/{execution_id}/status/
         """
         try:
-            status_info = self.orchestrator.get_workflow_status(pk)
-            
-            if not status_info:
+            # Only ids we issued; Celery reports unknown task ids as pending forever
+            workflow_id = cache.get(f"{EXECUTION_KEY_PREFIX}{pk}")
+            if workflow_id is None:
                 return Response(
-                    {'error': 'Workflow execution not found or completed'},
+                    {'error': 'Workflow execution not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
             
+            result = run_workflow_template.AsyncResult(pk)
+            status_info = {
+                'execution_id': pk,
+                'workflow_id': workflow_id,
+                'status': result.state.lower(),
+            }
+            if result.successful():
+                status_info['result'] = result.result
+            elif result.failed():
+                status_info['error'] = str(result.result)
+            
             return Response(status_info)
             
         except Exception as e:
@@ -287,7 +335,7 @@ class WorkflowViewSet(viewsets.ViewSet):
             )
     
     @action(detail=False, methods=['post'])
-    def quick_start(self, request):
+    async def quick_start(self, request):
         """
         Quick start workflows with common use cases
         
@@ -308,80 +356,29 @@ class WorkflowViewSet(viewsets.ViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Map use cases to workflows
-            workflow_mapping = {
-                'analyze_data': {
-                    'workflow_id': 'data_analysis_pipeline',
-                    'input_transform': lambda x: {
-                        'data_source': x,
-                        'analysis_type': 'descriptive',
-                        'output_format': 'report'
-                    }
-                },
-                'support_ticket': {
-                    'workflow_id': 'customer_support_ticket',
-                    'input_transform': lambda x: {
-                        'customer_message': x,
-                        'priority': 'medium'
-                    }
-                },
-                'code_review': {
-                    'workflow_id': 'code_review_process',
-                    'input_transform': lambda x: {
-                        'repository': x,
-                        'branch': 'main'
-                    }
-                },
-                'research': {
-                    'workflow_id': 'research_and_summarize',
-                    'input_transform': lambda x: {
-                        'research_query': x,
-                        'depth': 'moderate',
-                        'output_format': 'summary'
-                    }
-                },
-                'create_content': {
-                    'workflow_id': 'content_creation_workflow',
-                    'input_transform': lambda x: {
-                        'topic': x,
-                        'content_type': 'article',
-                        'length': 'medium',
-                        'tone': 'professional'
-                    }
-                },
-                'fix_bug': {
-                    'workflow_id': 'bug_investigation',
-                    'input_transform': lambda x: {
-                        'bug_description': x,
-                        'steps_to_reproduce': []
-                    }
-                },
-            }
-            
-            if use_case not in workflow_mapping:
+            quick_start = _QUICK_START_MAP.get(use_case)
+            if quick_start is None:
                 return Response(
                     {
                         'error': f'Unknown use case: {use_case}',
-                        'available_use_cases': list(workflow_mapping.keys())
+                        'available_use_cases': list(_QUICK_START_MAP)
                     },
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            workflow_config = workflow_mapping[use_case]
-            workflow_id = workflow_config['workflow_id']
-            input_data = workflow_config['input_transform'](user_input)
+            workflow_id, input_key, defaults = quick_start
+            input_data = {input_key: user_input, **defaults}
             
             # Get user ID
             user_id = request.user.id if request.user.is_authenticated else 1
             
             # Execute workflow
-            result = asyncio.run(
-                self.orchestrator.execute_workflow(
-                    workflow_id=workflow_id,
-                    input_data=input_data,
-                    user_id=user_id,
-                    session_id=None
-                )
+            result = await self._execute_cached(
+                request,
+                workflow_id=workflow_id,
+                input_data=input_data,
+                user_id=user_id,
+                session_id=None
             )
             
             return Response({
@@ -398,7 +395,7 @@ class WorkflowViewSet(viewsets.ViewSet):
             )
     
     @action(detail=False, methods=['get'])
-    def agent_capabilities(self, request):
+    async def agent_capabilities(self, request):
         """
         Get available agent capabilities for workflow planning
         
@@ -408,34 +405,37 @@ class WorkflowViewSet(viewsets.ViewSet):
             # Get user ID
             user_id = request.user.id if request.user.is_authenticated else 1
             
-            # Get all agents for user
-            agents = Agent.objects.filter(owner_id=user_id, is_active=True)
+            # Only the columns the response uses, as plain dicts
+            agents = Agent.objects.filter(owner_id=user_id, is_active=True).values(
+                'id', 'name', 'status', 'type', 'capabilities'
+            )
             
-            # Group by type and aggregate capabilities
+            # Group by type and aggregate capabilities in one pass
             capabilities_by_type = {}
-            for agent in agents:
-                agent_type = agent.type
-                if agent_type not in capabilities_by_type:
-                    capabilities_by_type[agent_type] = {
+            capability_sets = {}
+            async for agent in agents:
+                agent_type = agent['type']
+                entry = capabilities_by_type.get(agent_type)
+                if entry is None:
+                    entry = capabilities_by_type[agent_type] = {
                         'type': agent_type,
                         'count': 0,
-                        'capabilities': set(),
+                        'capabilities': [],
                         'agents': []
                     }
+                    capability_sets[agent_type] = set()
                 
-                capabilities_by_type[agent_type]['count'] += 1
-                capabilities_by_type[agent_type]['capabilities'].update(agent.capabilities)
-                capabilities_by_type[agent_type]['agents'].append({
-                    'id': str(agent.id),
-                    'name': agent.name,
-                    'status': agent.status
+                entry['count'] += 1
+                capability_sets[agent_type].update(agent['capabilities'])
+                entry['agents'].append({
+                    'id': str(agent['id']),
+                    'name': agent['name'],
+                    'status': agent['status']
                 })
             
-            # Convert sets to lists for JSON serialization
-            for agent_type in capabilities_by_type:
-                capabilities_by_type[agent_type]['capabilities'] = list(
-                    capabilities_by_type[agent_type]['capabilities']
-                )
+            # Sets aren't JSON serializable
+            for agent_type, capabilities in capability_sets.items():
+                capabilities_by_type[agent_type]['capabilities'] = list(capabilities)
             
             return Response({
                 'agent_types': list(capabilities_by_type.values())
@@ -448,22 +448,73 @@ class WorkflowViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    async def _execute_cached(self, request, workflow_id, input_data, user_id, session_id=None, callback=None):
+        """Run a workflow, reusing a recent successful result for identical input"""
+        ttl = settings.WORKFLOW_CACHE_TTL_BY_WORKFLOW.get(workflow_id, settings.WORKFLOW_CACHE_TTL)
+        use_cache = ttl > 0 and request.query_params.get('no_cache') != '1'
+        
+        if use_cache:
+            cache_key = _workflow_result_key(workflow_id, input_data, user_id, session_id)
+            result = await cache.aget(cache_key)
+            if result is not None:
+                return result
+        
+        result = await self.orchestrator.execute_workflow(
+            workflow_id=workflow_id,
+            input_data=input_data,
+            user_id=user_id,
+            session_id=session_id,
+            callback=callback
+        )
+        
+        if use_cache and result.get('success'):
+            await cache.aset(cache_key, result, ttl)
+        return result
+    
     def _create_progress_callback(self, session_id):
-        """Create a callback function for sending progress updates"""
+        """Create a coroutine callback that sends progress updates to the session.
+
+        Each update is a cumulative snapshot, so updates arriving within
+        PROGRESS_FLUSH_INTERVAL of each other are coalesced into one send of
+        the latest; the final one (all steps done) goes out immediately.
+        """
+        if not session_id:
+            return None
         
-        def callback(progress):
+        channel_layer = get_channel_layer()
+        group = f"session_{session_id}"
+        latest = None
+        flusher = None
+        
+        async def send_latest():
             """Send progress update via WebSocket"""
-            if session_id:
-                try:
-                    channel_layer = get_channel_layer()
-                    async_to_sync(channel_layer.group_send)(
-                        f"session_{session_id}",
-                        {
-                            'type': 'workflow_progress',
-                            'progress': progress
-                        }
-                    )
-                except Exception as e:
-                    logger.warning(f"Could not send progress update: {e}")
+            nonlocal latest
+            progress, latest = latest, None
+            if progress is None:
+                return
+            try:
+                await channel_layer.group_send(group, {
+                    'type': 'workflow_progress',
+                    'progress': progress
+                })
+            except Exception as e:
+                logger.warning(f"Could not send progress update: {e}")
+        
+        async def flush_later():
+            nonlocal flusher
+            await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+            flusher = None
+            await send_latest()
+        
+        async def callback(progress):
+            nonlocal latest, flusher
+            latest = progress
+            if progress['completed_steps'] >= progress['total_steps']:
+                if flusher is not None:
+                    flusher.cancel()
+                    flusher = None
+                await send_latest()
+            elif flusher is None:
+                flusher = asyncio.create_task(flush_later())
         
         return callback
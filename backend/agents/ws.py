@@ -0,0 +1,77 @@
+"""
+Synchronous helpers for sending to Channels groups from views and tasks.
+
+async_to_sync() sets up event-loop machinery on every call. With the Redis
+channel layer these helpers instead submit the group_send coroutines to one
+long-lived event loop that runs in a daemon thread, started lazily in each
+process. (Starting it in AppConfig.ready() would not work under gunicorn
+--preload: the thread would exist only in the master and not survive the
+fork into workers.)
+
+Any other layer goes through async_to_sync(). The in-memory layer hands
+messages to asyncio queues that consumers await on the server's loop, and
+those may only be touched from that loop.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the channel layer before giving up on a send
+SEND_TIMEOUT = 5
+
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop():
+    """Return this process's background loop, starting it on first use"""
+    global _loop, _loop_pid
+    if _loop_pid != os.getpid():
+        with _loop_lock:
+            if _loop_pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='ws-send-loop', daemon=True).start()
+                _loop, _loop_pid = loop, os.getpid()
+    return _loop
+
+
+def _uses_background_loop(channel_layer):
+    """Only the Redis layer is safe to drive from a loop of our own"""
+    try:
+        from channels_redis.core import RedisChannelLayer
+    except ImportError:
+        return False
+    return isinstance(channel_layer, RedisChannelLayer)
+
+
+async def _send_many(channel_layer, items):
+    await asyncio.gather(*(channel_layer.group_send(group, message) for group, message in items))
+
+
+def ws_send_many(items):
+    """Send (group, message) pairs concurrently and wait for them to be queued"""
+    channel_layer = get_channel_layer()
+    if not _uses_background_loop(channel_layer):
+        async_to_sync(_send_many)(channel_layer, items)
+        return
+
+    future = asyncio.run_coroutine_threadsafe(_send_many(channel_layer, items), _get_loop())
+    try:
+        future.result(timeout=SEND_TIMEOUT)
+    except FutureTimeoutError:
+        future.cancel()
+        logger.warning("Timed out sending %d channel layer message(s)", len(items))
+
+
+def ws_send(group, message):
+    """Send one message to a channel layer group"""
+    ws_send_many([(group, message)])
@@ -4,31 +4,96 @@ API endpoints for frontend integration
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from datetime import datetime, timedelta
-import json
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views.decorators.cache import cache_control, cache_page
+from django.views.decorators.vary import vary_on_headers
+import orjson
+
+
+def cached_stub(timeout):
+    """
+    Cache a stub response for ``timeout`` seconds, server-side per set of
+    credentials (as agents.url_utils.cache_viewset does) and in the client.
+    """
+    def decorator(view):
+        view = vary_on_headers('Authorization', 'Cookie')(view)
+        view = cache_page(timeout)(view)
+        return cache_control(private=True, max_age=timeout)(view)
+    return decorator
+
+
+# Constant payloads change only on deploy; timestamped ones go stale quickly
+STATIC_TTL = 60
+LIVE_TTL = 5
+
+# Payloads without timestamps are encoded once at import and skip DRF's
+# renderer entirely; the views still run so authentication and RBAC apply
+_EMPTY_RESULTS = orjson.dumps({'results': []})
+
+_INTEGRATIONS = orjson.dumps({
+    'results': [
+        {
+            'id': 1,
+            'name': 'Groq API',
+            'status': 'active',
+            'type': 'llm',
+            'description': 'Fast inference with Groq'
+        },
+        {
+            'id': 2,
+            'name': 'OpenAI API',
+            'status': 'active',
+            'type': 'llm',
+            'description': 'GPT models integration'
+        }
+    ]
+})
+
+_INTEGRATION_TEMPLATES = orjson.dumps({
+    'results': [
+        {
+            'id': 1,
+            'name': 'Chat Completion',
+            'type': 'llm',
+            'description': 'Standard chat completion template'
+        }
+    ]
+})
+
+_REPORT_METRICS = orjson.dumps({
+    'metrics': {
+        'total_agents': 702,
+        'active_agents': 45,
+        'total_messages': 1247,
+        'avg_response_time': 230
+    }
+})
+
+_REPORT_TEMPLATES = orjson.dumps({
+    'results': [
+        {
+            'id': 1,
+            'name': 'Agent Performance Report',
+            'description': 'Comprehensive agent performance metrics'
+        }
+    ]
+})
+
+_NOTIFICATION_SETTINGS = orjson.dumps({'email_enabled': True, 'push_enabled': False})
+
 
+def _prerendered(body):
+    return HttpResponse(body, content_type='application/json')
+
+
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def integrations_list(request):
     """List API integrations"""
-    return Response({
-        'results': [
-            {
-                'id': 1,
-                'name': 'Groq API',
-                'status': 'active',
-                'type': 'llm',
-                'description': 'Fast inference with Groq'
-            },
-            {
-                'id': 2,
-                'name': 'OpenAI API',
-                'status': 'active',
-                'type': 'llm',
-                'description': 'GPT models integration'
-            }
-        ]
-    })
+    return _prerendered(_INTEGRATIONS)
 
+@cached_stub(LIVE_TTL)
 @api_view(['GET'])
 def integrations_calls(request):
     """List integration calls"""
@@ -37,27 +102,20 @@ def integrations_calls(request):
             {
                 'id': 1,
                 'integration': 'Groq API',
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': timezone.now(),
                 'status': 'success',
                 'response_time': 150
             }
         ]
     })
 
-@api_view(['GET']) 
+@cached_stub(STATIC_TTL)
+@api_view(['GET'])
 def integrations_templates(request):
     """List integration templates"""
-    return Response({
-        'results': [
-            {
-                'id': 1,
-                'name': 'Chat Completion',
-                'type': 'llm',
-                'description': 'Standard chat completion template'
-            }
-        ]
-    })
+    return _prerendered(_INTEGRATION_TEMPLATES)
 
+@cached_stub(LIVE_TTL)
 @api_view(['GET'])
 def reports_charts(request):
     """Get chart data for reports"""
@@ -68,44 +126,31 @@ def reports_charts(request):
                 'title': 'Agent Activity',
                 'type': 'line',
                 'data': [
-                    {'timestamp': datetime.now().isoformat(), 'value': 85}
+                    {'timestamp': timezone.now(), 'value': 85}
                 ]
             }
         ]
     })
 
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def reports_metrics(request):
     """Get metrics data"""
-    return Response({
-        'metrics': {
-            'total_agents': 702,
-            'active_agents': 45,
-            'total_messages': 1247,
-            'avg_response_time': 230
-        }
-    })
+    return _prerendered(_REPORT_METRICS)
 
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def reports_templates(request):
     """Get report templates"""
-    return Response({
-        'results': [
-            {
-                'id': 1,
-                'name': 'Agent Performance Report',
-                'description': 'Comprehensive agent performance metrics'
-            }
-        ]
-    })
+    return _prerendered(_REPORT_TEMPLATES)
 
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def reports_custom(request):
     """Get custom reports"""
-    return Response({
-        'results': []
-    })
+    return _prerendered(_EMPTY_RESULTS)
 
+@cached_stub(LIVE_TTL)
 @api_view(['GET'])
 def notifications_list(request):
     """List notifications"""
@@ -116,31 +161,36 @@ def notifications_list(request):
                 'title': 'System Status',
                 'message': 'All agents operational',
                 'type': 'success',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timezone.now()
             }
         ]
     })
 
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def notifications_email_templates(request):
     """List email templates"""
-    return Response({'results': []})
+    return _prerendered(_EMPTY_RESULTS)
 
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def notifications_email_campaigns(request):
     """List email campaigns"""
-    return Response({'results': []})
+    return _prerendered(_EMPTY_RESULTS)
 
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def notifications_rules(request):
     """List notification rules"""
-    return Response({'results': []})
+    return _prerendered(_EMPTY_RESULTS)
 
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def notifications_settings(request):
     """Get notification settings"""
-    return Response({'email_enabled': True, 'push_enabled': False})
+    return _prerendered(_NOTIFICATION_SETTINGS)
 
+@cached_stub(LIVE_TTL)
 @api_view(['GET'])
 def data_pipelines(request):
     """List data pipelines"""
@@ -150,27 +200,31 @@ def data_pipelines(request):
                 'id': 1,
                 'name': 'Agent Data Pipeline',
                 'status': 'running',
-                'last_run': datetime.now().isoformat()
+                'last_run': timezone.now()
             }
         ]
     })
 
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def data_connections(request):
     """List data connections"""
-    return Response({'results': []})
+    return _prerendered(_EMPTY_RESULTS)
 
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def data_pipeline_executions(request):
     """List pipeline executions"""
-    return Response({'results': []})
+    return _prerendered(_EMPTY_RESULTS)
 
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def data_quality_rules(request):
     """List data quality rules"""  
-    return Response({'results': []})
+    return _prerendered(_EMPTY_RESULTS)
 
+@cached_stub(STATIC_TTL)
 @api_view(['GET'])
 def data_pipeline_templates(request):
     """List pipeline templates"""
-    return Response({'results': []})
\ No newline at end of file
+    return _prerendered(_EMPTY_RESULTS)
\ No newline at end of file
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_integrations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apicallresult',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='apicallresult',
+            name='response_size',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
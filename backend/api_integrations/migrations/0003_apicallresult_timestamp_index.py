@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_integrations', '0002_apicallresult_status_code_response_size'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apicallresult',
+            index=models.Index(fields=['timestamp'], name='api_integra_timesta_4b701e_idx'),
+        ),
+    ]
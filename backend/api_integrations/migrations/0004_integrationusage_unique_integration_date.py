@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_integrations', '0003_apicallresult_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='integrationusage',
+            unique_together={('integration', 'date')},
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+def backfill_sums(apps, schema_editor):
+    sum_from_avg = Cast(F('avg_response_time') * F('total_calls'), models.BigIntegerField())
+    for model_name in ('APIIntegration', 'IntegrationUsage'):
+        apps.get_model('api_integrations', model_name).objects.update(sum_response_time_ms=sum_from_avg)
+
+
+def average_response_time():
+    return Coalesce(
+        Cast('sum_response_time_ms', models.FloatField()) / NullIf(F('total_calls'), 0),
+        Value(0.0),
+        output_field=models.FloatField(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_integrations', '0004_integrationusage_unique_integration_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apiintegration',
+            name='sum_response_time_ms',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='integrationusage',
+            name='sum_response_time_ms',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_sums, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='apiintegration',
+            name='avg_response_time',
+        ),
+        migrations.RemoveField(
+            model_name='integrationusage',
+            name='avg_response_time',
+        ),
+        migrations.AddField(
+            model_name='apiintegration',
+            name='avg_response_time',
+            field=models.GeneratedField(
+                db_persist=True, expression=average_response_time(), output_field=models.FloatField()
+            ),
+        ),
+        migrations.AddField(
+            model_name='integrationusage',
+            name='avg_response_time',
+            field=models.GeneratedField(
+                db_persist=True, expression=average_response_time(), output_field=models.FloatField()
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_integrations', '0005_sum_response_time_ms'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apicallresult',
+            index=models.Index(fields=['integration', '-timestamp'], name='api_integra_integra_cb49ff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='integrationalert',
+            index=models.Index(
+                condition=models.Q(('resolved', False)),
+                fields=['integration', '-created_at'],
+                name='integration_alert_open_idx',
+            ),
+        ),
+    ]
@@ -1,10 +1,24 @@
 from django.db import models
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.contrib.auth import get_user_model
 from django.conf import settings
 import uuid
 
+import orjson
+
 User = get_user_model()
 
+
+def _average_response_time():
+    """Mean response time in ms, derived from the running sum so updates stay a single F() increment"""
+    return Coalesce(
+        Cast('sum_response_time_ms', FloatField()) / NullIf(F('total_calls'), 0),
+        Value(0.0),
+        output_field=FloatField(),
+    )
+
+
 class APIIntegration(models.Model):
     TYPE_CHOICES = [
         ('REST', 'REST API'),
@@ -54,7 +68,10 @@ class APIIntegration(models.Model):
     last_tested = models.DateTimeField(null=True, blank=True)
     success_rate = models.FloatField(default=0.0)
     total_calls = models.BigIntegerField(default=0)
-    avg_response_time = models.FloatField(default=0.0)
+    sum_response_time_ms = models.BigIntegerField(default=0)
+    avg_response_time = models.GeneratedField(
+        expression=_average_response_time(), output_field=models.FloatField(), db_persist=True
+    )
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='api_integrations')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -74,6 +91,22 @@ class APICallResult(models.Model):
     error_message = models.TextField(blank=True)
     request_data = models.JSONField(null=True, blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
+    # Denormalized so metrics can filter/aggregate without reading the JSON bodies
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_size = models.PositiveIntegerField(default=0)  # encoded response_data, in bytes
+
+    class Meta:
+        indexes = [
+            # Range scans by time, e.g. pruning expired rows
+            models.Index(fields=['timestamp']),
+            # Latest calls for one integration, newest first
+            models.Index(fields=['integration', '-timestamp']),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.response_data is not None:
+            self.response_size = len(orjson.dumps(self.response_data))
+        super().save(*args, **kwargs)
 
 class APITemplate(models.Model):
     CATEGORY_CHOICES = [
@@ -108,9 +141,16 @@ class IntegrationUsage(models.Model):
     total_calls = models.IntegerField(default=0)
     successful_calls = models.IntegerField(default=0)
     failed_calls = models.IntegerField(default=0)
-    avg_response_time = models.FloatField(default=0.0)
+    sum_response_time_ms = models.BigIntegerField(default=0)
+    avg_response_time = models.GeneratedField(
+        expression=_average_response_time(), output_field=models.FloatField(), db_persist=True
+    )
     total_data_transferred = models.BigIntegerField(default=0)  # in bytes
 
+    class Meta:
+        unique_together = ['integration', 'date']
+
+
 class IntegrationAlert(models.Model):
     SEVERITY_CHOICES = [
         ('low', 'Low'),
@@ -129,3 +169,13 @@ class IntegrationAlert(models.Model):
     resolved = models.BooleanField(default=False)
     resolved_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Open alerts per integration; resolved ones are left out of the index
+            models.Index(
+                fields=['integration', '-created_at'],
+                condition=models.Q(resolved=False),
+                name='integration_alert_open_idx',
+            ),
+        ]
@@ -15,6 +15,14 @@ class APIIntegrationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'last_used', 'success_rate', 'avg_response_time']
 
 
+class APIIntegrationListSerializer(serializers.ModelSerializer):
+    """Row summary for integration lists; the JSON config columns are left to the detail view"""
+    class Meta:
+        model = APIIntegration
+        fields = ['id', 'name', 'type', 'status', 'success_rate', 'avg_response_time']
+        read_only_fields = fields
+
+
 class APITemplateSerializer(serializers.ModelSerializer):
     class Meta:
         model = APITemplate
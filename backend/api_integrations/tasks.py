@@ -0,0 +1,105 @@
+"""
+Periodic maintenance for API integration accounting (see CELERY_BEAT_SCHEDULE).
+
+rollup_usage drains the call counters buffered by usage.record_api_call into
+IntegrationUsage. APICallResult keeps a row per failed call, so old rows are
+pruned in bounded batches rather than by one huge DELETE.
+"""
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .models import APICallResult, APIIntegration, IntegrationUsage
+from .usage import USAGE_FIELDS, usage_key
+
+logger = logging.getLogger(__name__)
+
+# Rows deleted per statement; keeps each DELETE (and its lock) short
+PRUNE_BATCH_SIZE = 5000
+
+
+@shared_task(ignore_result=True)
+def prune_call_results():
+    """Delete call results older than the metrics retention window"""
+    retention_days = settings.PERFORMANCE_MONITORING['METRICS_RETENTION_DAYS']
+    expired = APICallResult.objects.filter(timestamp__lt=timezone.now() - timedelta(days=retention_days))
+
+    deleted = 0
+    while True:
+        batch = list(expired.values_list('pk', flat=True)[:PRUNE_BATCH_SIZE])
+        if not batch:
+            break
+        deleted += APICallResult.objects.filter(pk__in=batch).delete()[0]
+
+    if deleted:
+        logger.info("Pruned %d API call results older than %d days", deleted, retention_days)
+
+
+def _drain_counters(integration_id, day):
+    """Take the buffered counters for one integration and day, leaving any
+    increments that land meanwhile for the next run"""
+    keys = {field: usage_key(integration_id, day, field) for field in USAGE_FIELDS}
+    values = cache.get_many(keys.values())
+    counts = {field: values.get(key) or 0 for field, key in keys.items()}
+    for field, count in counts.items():
+        if count:
+            try:
+                cache.decr(keys[field], count)
+            except ValueError:
+                pass
+    return counts
+
+
+@shared_task(ignore_result=True)
+def rollup_usage():
+    """Fold buffered per-day call counters into IntegrationUsage"""
+    today = timezone.localdate()
+    integration_ids = list(APIIntegration.objects.values_list('id', flat=True))
+
+    # Yesterday too, for counts that arrived after the last run before midnight
+    for day in (today - timedelta(days=1), today):
+        drained = {}
+        for integration_id in integration_ids:
+            counts = _drain_counters(integration_id, day)
+            if counts['total_calls']:
+                drained[integration_id] = counts
+        if not drained:
+            continue
+
+        # Counters are deltas: merge them into the stored totals, then write
+        # every row back with one upsert
+        existing = {
+            usage.integration_id: usage
+            for usage in IntegrationUsage.objects.filter(integration_id__in=drained, date=day)
+        }
+        rows = []
+        for integration_id, counts in drained.items():
+            usage = existing.get(integration_id) or IntegrationUsage(integration_id=integration_id, date=day)
+            usage.total_calls += counts['total_calls']
+            usage.sum_response_time_ms += counts['response_time_ms']
+            usage.successful_calls += counts['successful_calls']
+            usage.failed_calls += counts['failed_calls']
+            usage.total_data_transferred += counts['data_transferred']
+            rows.append(usage)
+
+        IntegrationUsage.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['integration', 'date'],
+            update_fields=[
+                'total_calls', 'successful_calls', 'failed_calls',
+                'sum_response_time_ms', 'total_data_transferred',
+            ],
+        )
+
+        for integration_id, counts in drained.items():
+            APIIntegration.objects.filter(id=integration_id).update(
+                total_calls=F('total_calls') + counts['total_calls'],
+                sum_response_time_ms=F('sum_response_time_ms') + counts['response_time_ms'],
+            )
@@ -0,0 +1,64 @@
+"""
+Buffered API call accounting.
+
+Healthy calls only bump per-day counters in the cache (Redis in production);
+tasks.rollup_usage drains them into IntegrationUsage every minute. A full
+APICallResult row is written only for failed calls, where the request and
+response bodies are worth keeping.
+"""
+
+import orjson
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import APICallResult
+
+# Counters buffered per integration per day, as integers
+USAGE_FIELDS = ('total_calls', 'successful_calls', 'failed_calls', 'response_time_ms', 'data_transferred')
+
+# Long enough to survive a missed rollup or two, short enough to expire stale days
+USAGE_KEY_TTL = 60 * 60 * 48
+
+
+def usage_key(integration_id, day, field):
+    return f"apiusage:{integration_id}:{day.isoformat()}:{field}"
+
+
+def _incr(key, delta):
+    cache.add(key, 0, USAGE_KEY_TTL)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(key, delta, USAGE_KEY_TTL)
+
+
+def record_api_call(integration_id, status, response_time, response_data=None,
+                    request_data=None, error_message='', status_code=None):
+    """
+    Account for one call to an integration.
+
+    response_time is in milliseconds, as stored on APICallResult.
+    """
+    counters = {
+        'total_calls': 1,
+        'successful_calls' if status == 'success' else 'failed_calls': 1,
+        'response_time_ms': round(response_time),
+    }
+    if response_data is not None:
+        counters['data_transferred'] = len(orjson.dumps(response_data))
+
+    day = timezone.localdate()
+    for field, delta in counters.items():
+        _incr(usage_key(integration_id, day, field), delta)
+
+    if status != 'success':
+        APICallResult.objects.create(
+            integration_id=integration_id,
+            status=status,
+            response_time=response_time,
+            response_data=response_data,
+            request_data=request_data,
+            error_message=error_message,
+            status_code=status_code,
+        )
@@ -5,7 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 
 from .models import APIIntegration, APITemplate
-from .serializers import APIIntegrationSerializer, APITemplateSerializer
+from .serializers import APIIntegrationListSerializer, APIIntegrationSerializer, APITemplateSerializer
 
 
 class APIIntegrationListCreateView(generics.ListCreateAPIView):
@@ -14,10 +14,19 @@ class APIIntegrationListCreateView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return APIIntegration.objects.filter(user=self.request.user)
+        queryset = APIIntegration.objects.filter(created_by=self.request.user)
+        if self.request.method == 'GET':
+            # Only the columns APIIntegrationListSerializer renders
+            queryset = queryset.only(*APIIntegrationListSerializer.Meta.fields)
+        return queryset
+    
+    def get_serializer_class(self):
+        if self.request.method == 'GET':
+            return APIIntegrationListSerializer
+        return APIIntegrationSerializer
     
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(created_by=self.request.user)
 
 
 class APIIntegrationDetailView(generics.RetrieveUpdateDestroyAPIView):
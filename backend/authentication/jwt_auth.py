@@ -4,13 +4,65 @@ JWT Authentication for Enterprise-grade security
 from rest_framework import authentication, exceptions
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 import jwt
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import hashlib
 import logging
+import time
+
+from .signals import USER_CACHE_TTL, user_cache_key
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Shared PyJWT instance and decode arguments, built once rather than per call
+_JWT = jwt.PyJWT()
+JWT_ALGORITHM = 'HS256'
+_ALGORITHMS = (JWT_ALGORITHM,)
+_DECODE_OPTIONS = {'require': ['exp', 'iat', 'user_id']}
+
+# Verified token payloads, per process and keyed by a digest of the token.
+# A hit is only reused until the token's own exp, so it never accepts a
+# token that jwt.decode would reject.
+VERIFIED_TOKEN_CACHE_SIZE = 4096
+_verified_tokens = OrderedDict()
+
+
+def _token_key(token):
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+# The columns cached for an authenticated user. Credentials (the password
+# hash) never leave the database; any other field is loaded from it on first
+# access, and save() writes back only the loaded fields.
+USER_CACHE_FIELDS = ('id', 'email', 'username', 'is_active', 'role', 'is_superuser', 'is_staff')
+
+
+def get_cached_user(user_id):
+    """
+    Load a user through the cache; authentication.signals evicts it on save/delete
+    """
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.only(*USER_CACHE_FIELDS).get(id=user_id)
+        cache.set(key, user, USER_CACHE_TTL)
+    return user
+
+
+async def aget_cached_user(user_id):
+    """
+    Async counterpart of get_cached_user
+    """
+    key = user_cache_key(user_id)
+    user = await cache.aget(key)
+    if user is None:
+        user = await User.objects.only(*USER_CACHE_FIELDS).aget(id=user_id)
+        await cache.aset(key, user, USER_CACHE_TTL)
+    return user
+
 
 class JWTAuthentication(authentication.BaseAuthentication):
     """
@@ -18,51 +70,116 @@ class JWTAuthentication(authentication.BaseAuthentication):
     """
     
     authentication_header_prefix = 'Bearer'
+    _prefix_lower = authentication_header_prefix.lower()
     
     def authenticate(self, request):
         """
         Authenticate request using JWT token
         """
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+        token = self._get_token(request)
+        if token is None:
+            return None
         
-        if not auth_header:
+        return self._authenticate_credentials(token)
+    
+    async def aauthenticate(self, request):
+        """
+        Authenticate request using JWT token, awaiting the user lookup
+        """
+        token = self._get_token(request)
+        if token is None:
             return None
         
+        # Verification is CPU-only and cached; only the user lookup is I/O
+        payload = self._verified_payload(token)
         try:
-            prefix, token = auth_header.split(' ')
-            
-            if prefix.lower() != self.authentication_header_prefix.lower():
-                return None
-            
-            return self._authenticate_credentials(token)
-            
-        except ValueError:
+            user = await aget_cached_user(payload['user_id'])
+        except User.DoesNotExist:
+            raise exceptions.AuthenticationFailed('User not found')
+        
+        return self._check_user(user, token)
+    
+    def _get_token(self, request):
+        """
+        Extract the bearer token, or None when the header uses another scheme
+        """
+        auth_header = request.META.get('HTTP_AUTHORIZATION')
+        
+        if not auth_header:
+            return None
+        
+        prefix, sep, token = auth_header.partition(' ')
+        
+        if prefix.lower() != self._prefix_lower:
+            return None
+        
+        if not sep or not token or ' ' in token:
             raise exceptions.AuthenticationFailed('Invalid authorization header format')
+        
+        return token
     
     def _authenticate_credentials(self, token):
         """
         Validate JWT token and return user
         """
+        payload = self._verified_payload(token)
         try:
-            payload = jwt.decode(
-                token,
-                settings.SECRET_KEY,
-                algorithms=['HS256']
-            )
-        except jwt.ExpiredSignatureError:
-            raise exceptions.AuthenticationFailed('Token has expired')
-        except jwt.InvalidTokenError:
-            raise exceptions.AuthenticationFailed('Invalid token')
-        
-        try:
-            user = User.objects.get(id=payload['user_id'])
+            user = get_cached_user(payload['user_id'])
         except User.DoesNotExist:
             raise exceptions.AuthenticationFailed('User not found')
         
+        return self._check_user(user, token)
+    
+    def _check_user(self, user, token):
         if not user.is_active:
             raise exceptions.AuthenticationFailed('User account is disabled')
         
         return (user, token)
+    
+    def _verified_payload(self, token):
+        """
+        Return the token's payload, reusing an earlier verification when possible
+        """
+        key = _token_key(token)
+        payload = _verified_tokens.get(key)
+        if payload is None or payload['exp'] <= time.time():
+            _verified_tokens.pop(key, None)
+            payload = self._decode(token)
+            if len(_verified_tokens) >= VERIFIED_TOKEN_CACHE_SIZE:
+                # Drop the oldest entry. popitem is atomic, unlike iterating
+                # the dict, which sync and async callers share across threads
+                try:
+                    _verified_tokens.popitem(last=False)
+                except KeyError:
+                    pass
+            _verified_tokens[key] = payload
+        return payload
+    
+    def _decode(self, token):
+        """
+        Verify the token signature and expiry
+        """
+        try:
+            return _JWT.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=_ALGORITHMS,
+                options=_DECODE_OPTIONS
+            )
+        except jwt.ExpiredSignatureError:
+            raise exceptions.AuthenticationFailed('Token has expired')
+        except jwt.InvalidTokenError:
+            raise exceptions.AuthenticationFailed('Invalid token')
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication for adrf views: adrf awaits a coroutine ``authenticate``,
+    so the user lookup no longer takes a thread of its own
+    """
+    
+    async def authenticate(self, request):
+        return await self.aauthenticate(request)
 
 
 def generate_access_token(user):
@@ -78,7 +195,7 @@ def generate_access_token(user):
         'type': 'access'
     }
     
-    return jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
+    return _JWT.encode(payload, settings.SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 
 def generate_refresh_token(user):
@@ -92,30 +209,52 @@ def generate_refresh_token(user):
         'type': 'refresh'
     }
     
-    return jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
+    return _JWT.encode(payload, settings.SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 
-def refresh_access_token(refresh_token):
+def _verify_refresh_token(refresh_token):
     """
-    Generate new access token from refresh token
+    Verify a refresh token and return its payload
     """
     try:
-        payload = jwt.decode(
+        # Reject access tokens sent here before paying for the signature check
+        claims = _JWT.decode(refresh_token, options={'verify_signature': False})
+        if claims.get('type') != 'refresh':
+            raise exceptions.AuthenticationFailed('Invalid token type')
+        
+        return _JWT.decode(
             refresh_token,
             settings.SECRET_KEY,
-            algorithms=['HS256']
+            algorithms=_ALGORITHMS,
+            options=_DECODE_OPTIONS
         )
-        
-        if payload.get('type') != 'refresh':
-            raise exceptions.AuthenticationFailed('Invalid token type')
-        
-        user = User.objects.get(id=payload['user_id'])
-        
-        return generate_access_token(user)
-        
     except jwt.ExpiredSignatureError:
         raise exceptions.AuthenticationFailed('Refresh token has expired')
     except jwt.InvalidTokenError:
         raise exceptions.AuthenticationFailed('Invalid refresh token')
+
+
+def refresh_access_token(refresh_token):
+    """
+    Generate new access token from refresh token
+    """
+    payload = _verify_refresh_token(refresh_token)
+    try:
+        user = get_cached_user(payload['user_id'])
     except User.DoesNotExist:
         raise exceptions.AuthenticationFailed('User not found')
+    
+    return generate_access_token(user)
+
+
+async def arefresh_access_token(refresh_token):
+    """
+    Async counterpart of refresh_access_token
+    """
+    payload = _verify_refresh_token(refresh_token)
+    try:
+        user = await aget_cached_user(payload['user_id'])
+    except User.DoesNotExist:
+        raise exceptions.AuthenticationFailed('User not found')
+    
+    return generate_access_token(user)
@@ -2,12 +2,25 @@
 Role-Based Access Control (RBAC) for enterprise security
 """
 from rest_framework import permissions
-from django.core.cache import cache
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _is_owner(obj, user):
+    """
+    Whether ``user`` owns ``obj``, compared on the foreign key column so the
+    related user row is never loaded
+    """
+    for field in ('owner', 'user'):
+        if hasattr(obj, f'{field}_id'):
+            if getattr(obj, f'{field}_id') == user.pk:
+                return True
+        elif hasattr(obj, field) and getattr(obj, field) == user:
+            return True
+    return False
+
+
 class RBACPermission(permissions.BasePermission):
     """
     Advanced Role-Based Access Control
@@ -15,7 +28,7 @@ class RBACPermission(permissions.BasePermission):
     - Role hierarchy
     - Resource-level permissions
     - Dynamic permission checking
-    - Permission caching
+    - Precomputed per-role permission sets
     """
     
     # Define role hierarchy (higher number = more privileges)
@@ -87,7 +100,7 @@ class RBACPermission(permissions.BasePermission):
             return True
         
         # Check if user has required permission
-        return self._user_has_permission(request.user, required_permission)
+        return self._user_has_permission(request, required_permission)
     
     def has_object_permission(self, request, view, obj):
         """
@@ -101,16 +114,13 @@ class RBACPermission(permissions.BasePermission):
             return True
         
         # Check object ownership
-        if hasattr(obj, 'owner') and obj.owner == request.user:
-            return True
-        
-        if hasattr(obj, 'user') and obj.user == request.user:
+        if _is_owner(obj, request.user):
             return True
         
         # Check role-based permissions
         required_permission = self._get_required_permission(request, view)
         if required_permission:
-            return self._user_has_permission(request.user, required_permission)
+            return self._user_has_permission(request, required_permission)
         
         return False
     
@@ -156,35 +166,39 @@ class RBACPermission(permissions.BasePermission):
         
         return f"{permission_type}_{resource}"
     
-    def _user_has_permission(self, user, permission):
+    @classmethod
+    def _build_effective_permissions(cls):
         """
-        Check if user has specific permission based on their role
+        Precompute each role's permissions, including those inherited from
+        lower-level roles
         """
-        # Check cache first
-        cache_key = f"rbac:user_{user.id}:perm_{permission}"
-        cached_result = cache.get(cache_key)
-        if cached_result is not None:
-            return cached_result
-        
-        # Get user role
-        user_role = self._get_user_role(user)
-        
-        # Get permissions for role
-        role_permissions = self.ROLE_PERMISSIONS.get(user_role, [])
-        
-        # Check if role has all permissions
-        if '*' in role_permissions:
-            cache.set(cache_key, True, 300)  # Cache for 5 minutes
-            return True
-        
-        # Check if specific permission is granted
-        has_perm = permission in role_permissions
+        effective = {}
+        for role, level in cls.ROLE_HIERARCHY.items():
+            permissions = set(cls.ROLE_PERMISSIONS.get(role, []))
+            for other_role, other_level in cls.ROLE_HIERARCHY.items():
+                if other_level < level:
+                    permissions.update(cls.ROLE_PERMISSIONS.get(other_role, []))
+            effective[role] = frozenset(permissions)
+        cls._EFFECTIVE_PERMISSIONS = effective
+    
+    def _user_has_permission(self, request, permission):
+        """
+        Check if the request's user has specific permission based on their role
+        """
+        # Results are memoized on the request, so per-object checks on a
+        # list reuse the answer given for the view
+        checked = getattr(request, '_rbac_cache', None)
+        if checked is None:
+            checked = request._rbac_cache = {}
+        elif permission in checked:
+            return checked[permission]
         
-        # If not found, check role hierarchy
-        if not has_perm:
-            has_perm = self._check_inherited_permissions(user_role, permission)
+        # Get user role, resolved at most once per request
+        if not hasattr(request, '_rbac_role'):
+            request._rbac_role = self._get_user_role(request.user)
         
-        cache.set(cache_key, has_perm, 300)  # Cache for 5 minutes
+        role_permissions = self._EFFECTIVE_PERMISSIONS.get(request._rbac_role, frozenset())
+        checked[permission] = has_perm = '*' in role_permissions or permission in role_permissions
         return has_perm
     
     def _get_user_role(self, user):
@@ -196,27 +210,17 @@ class RBACPermission(permissions.BasePermission):
             return user.role
         
         # Check user groups
-        if user.groups.exists():
-            role_name = user.groups.first().name.lower()
+        group = user.groups.only('name').first()
+        if group is not None:
+            role_name = group.name.lower()
             if role_name in self.ROLE_HIERARCHY:
                 return role_name
         
         # Default role
         return 'user'
-    
-    def _check_inherited_permissions(self, role, permission):
-        """
-        Check if permission is inherited from lower-level roles
-        """
-        current_level = self.ROLE_HIERARCHY.get(role, 0)
-        
-        for other_role, level in self.ROLE_HIERARCHY.items():
-            if level < current_level:
-                other_permissions = self.ROLE_PERMISSIONS.get(other_role, [])
-                if permission in other_permissions:
-                    return True
-        
-        return False
+
+
+RBACPermission._build_effective_permissions()
 
 
 class IsOwnerOrAdmin(permissions.BasePermission):
@@ -229,12 +233,12 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         if request.user.is_staff or request.user.is_superuser:
             return True
         
-        # Check ownership
-        if hasattr(obj, 'owner'):
-            return obj.owner == request.user
-        
-        if hasattr(obj, 'user'):
-            return obj.user == request.user
+        # Check ownership, on the foreign key column where there is one
+        for field in ('owner', 'user'):
+            if hasattr(obj, f'{field}_id'):
+                return getattr(obj, f'{field}_id') == request.user.pk
+            if hasattr(obj, field):
+                return getattr(obj, field) == request.user
         
         return False
 
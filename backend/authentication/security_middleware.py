@@ -162,6 +162,16 @@ class AuditLoggingMiddleware:
         self.get_response = get_response
     
     def __call__(self, request):
+        # Polling reads flagged by ShortCircuitMiddleware: only record auth failures
+        if getattr(request, '_short_circuit', False):
+            response = self.get_response(request)
+            if response.status_code in (401, 403):
+                logger.warning(
+                    f"AUDIT: Unauthorized access attempt - {request.method} {request.path} "
+                    f"from {self._get_client_ip(request)}"
+                )
+            return response
+        
         start_time = time.time()
         
         # Capture request details
@@ -0,0 +1,21 @@
+"""
+Signal receivers for the authentication app (connected in AuthenticationConfig.ready).
+"""
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CustomUser
+
+# Authenticated users are cached this long; saves and deletes evict sooner
+USER_CACHE_TTL = 60
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.pk))
@@ -1,9 +1,12 @@
 """
 Advanced caching decorators and utilities
 """
-from functools import wraps
+from functools import lru_cache, wraps
 from django.core.cache import cache
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_script_prefix, get_urlconf, reverse
 import hashlib
 import json
 import logging
@@ -205,6 +208,46 @@ def _invalidate_pattern(pattern: str):
         logger.warning(f"Cache backend doesn't support pattern deletion: {pattern}")
 
 
+@lru_cache(maxsize=4096)
+def _reverse_cached(viewname, args, kwargs, urlconf, current_app, prefix):
+    """Memoized reverse; ``prefix`` keys the entry on the active script prefix"""
+    return reverse(
+        viewname,
+        urlconf=urlconf,
+        args=args or None,
+        kwargs=dict(kwargs) or None,
+        current_app=current_app,
+    )
+
+
+def cached_reverse(viewname, urlconf=None, args=None, kwargs=None, current_app=None):
+    """
+    Drop-in replacement for ``django.urls.reverse`` backed by a process-wide LRU.
+    
+    Repeated reverses of the same route (e.g. one per row on list endpoints)
+    become a dict lookup instead of a walk of the URL resolver.
+    """
+    try:
+        return _reverse_cached(
+            viewname,
+            tuple(args or ()),
+            frozenset((kwargs or {}).items()),
+            urlconf or get_urlconf(),
+            current_app,
+            get_script_prefix(),
+        )
+    except TypeError:
+        # Unhashable arguments can't be memoized
+        return reverse(viewname, urlconf=urlconf, args=args, kwargs=kwargs, current_app=current_app)
+
+
+@receiver(setting_changed)
+def _clear_reverse_cache(sender, setting, **kwargs):
+    """Drop memoized URLs when the URLconf changes (e.g. override_settings in tests)"""
+    if setting == 'ROOT_URLCONF':
+        _reverse_cached.cache_clear()
+
+
 class CacheManager:
     """
     Centralized cache management with statistics
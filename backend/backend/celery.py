@@ -0,0 +1,16 @@
+"""
+Celery application for the backend project.
+
+Workers are started with ``celery -A backend worker`` (see docker-compose.yml);
+configuration is read from the CELERY_* Django settings.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+app = Celery('backend')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
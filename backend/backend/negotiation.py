@@ -0,0 +1,19 @@
+"""
+Content negotiation for the JSON-only API
+"""
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class JSONOnlyContentNegotiation(DefaultContentNegotiation):
+    """
+    Skip Accept-header and ``?format=`` negotiation for responses.
+
+    The API only ships a JSON renderer, so matching the client's media-type
+    list against it on every request is wasted work; the first configured
+    renderer is always used. Parser selection (JSON vs. multipart uploads)
+    still follows the request's Content-Type.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        renderer = renderers[0]
+        return renderer, renderer.media_type
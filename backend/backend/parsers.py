@@ -0,0 +1,22 @@
+"""
+Request parsers for the JSON API
+"""
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """
+    ``JSONParser`` backed by orjson.
+
+    Decodes the raw body bytes in one call instead of wrapping the stream in
+    a text decoder for the stdlib ``json`` module. Like DRF's strict mode,
+    orjson rejects ``NaN``/``Infinity`` literals.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % exc)
@@ -0,0 +1,26 @@
+"""
+Response renderers for the JSON API
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` backed by orjson.
+
+    orjson encodes dicts, lists, datetimes, UUIDs and numpy values natively
+    and returns bytes directly. Anything else (Decimal, timedelta, lazy
+    strings, querysets) falls back to DRF's ``JSONEncoder.default`` so
+    output matches the stock renderer. Non-string keys are stringified like
+    the stdlib encoder does, and UTC datetimes end in ``Z`` as DRF writes them.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+    _default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self._default, option=self.options)
@@ -62,6 +62,8 @@ INSTALLED_APPS = [
 
 # Add performance tracking middleware
 MIDDLEWARE = [
+    # Flags hot polling endpoints so later middleware can skip optional work
+    'agents.middleware.ShortCircuitMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -196,10 +198,11 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'backend.renderers.ORJSONRenderer',
     ],
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS': 'backend.negotiation.JSONOnlyContentNegotiation',
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'backend.parsers.ORJSONParser',
         'rest_framework.parsers.MultiPartParser',
         'rest_framework.parsers.FileUploadParser',
     ],
@@ -219,33 +222,60 @@ REST_FRAMEWORK = {
 # Channels Configuration
 ASGI_APPLICATION = 'backend.asgi.application'
 
-# Use in-memory channel layer for development (no Redis required)
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
-    },
-}
-
-# For production, uncomment below and ensure Redis is running:
-# CHANNEL_LAYERS = {
-#     'default': {
-#         'BACKEND': 'channels_redis.core.RedisChannelLayer',
-#         'CONFIG': {
-#             "hosts": [('127.0.0.1', 6379)],
-#         },
-#     },
-# }
-
 # Redis Configuration
-REDIS_URL = 'redis://localhost:6379/0'
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 
 # Celery Configuration
-CELERY_BROKER_URL = 'redis://localhost:6379/1'
-CELERY_RESULT_BACKEND = 'redis://localhost:6379/1'
+# Without a broker (local development) tasks run inline in the web process
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', str(DEBUG)).lower() == 'true'
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', REDIS_URL)
+# Eager results are kept in process memory so workflow status polling works
+# without Redis too
+CELERY_RESULT_BACKEND = os.getenv(
+    'CELERY_RESULT_BACKEND', 'cache+memory://' if CELERY_TASK_ALWAYS_EAGER else CELERY_BROKER_URL
+)
+CELERY_TASK_STORE_EAGER_RESULT = True
+
+if CELERY_TASK_ALWAYS_EAGER:
+    # Everything that sends to a group runs in this process; no Redis required
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
+else:
+    # Workers send agent replies and workflow progress to groups whose
+    # consumers live in the web process, so the layer has to be shared
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {
+                'hosts': [os.getenv('CHANNEL_LAYER_URL', REDIS_URL)],
+            },
+        },
+    }
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Report STARTED, so a running workflow can be told apart from a queued one
+CELERY_TASK_TRACK_STARTED = True
+# Multi-step workflows hold a worker for minutes; keep them off the default
+# queue so message/task processing isn't stuck behind them
+CELERY_TASK_ROUTES = {
+    'agents.tasks.run_workflow': {'queue': 'workflows'},
+    'agents.tasks.run_workflow_template': {'queue': 'workflows'},
+}
+CELERY_BEAT_SCHEDULE = {
+    'rollup-api-usage': {
+        'task': 'api_integrations.tasks.rollup_usage',
+        'schedule': 60,
+    },
+    'prune-api-call-results': {
+        'task': 'api_integrations.tasks.prune_call_results',
+        'schedule': 60 * 60 * 24,
+    },
+}
 
 # API Keys
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
@@ -341,6 +371,12 @@ PERFORMANCE_MONITORING = {
     'METRICS_RETENTION_DAYS': 30,
 }
 
+# Workflow result cache: successful runs of the same workflow with the same
+# input are reused for this many seconds (0 disables it; ?no_cache=1 bypasses it)
+WORKFLOW_CACHE_TTL = 60 * 60
+# Per-workflow overrides of WORKFLOW_CACHE_TTL, keyed by template id
+WORKFLOW_CACHE_TTL_BY_WORKFLOW = {}
+
 # Enhanced Agent Configuration
 AGENT_CONFIG = {
     'MAX_AGENTS': 10,
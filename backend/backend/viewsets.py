@@ -0,0 +1,22 @@
+"""
+Base viewsets for the async (adrf) API views
+"""
+from adrf.viewsets import ViewSet
+from rest_framework.settings import api_settings
+
+from authentication.jwt_auth import AsyncJWTAuthentication, JWTAuthentication
+
+
+class AsyncViewSet(ViewSet):
+    """
+    adrf ``ViewSet`` that authenticates JWT requests with
+    ``AsyncJWTAuthentication``.
+
+    adrf awaits a coroutine ``authenticate``, so the user lookup doesn't
+    block the event loop; the other default schemes are kept as configured.
+    """
+
+    authentication_classes = [
+        AsyncJWTAuthentication if auth_class is JWTAuthentication else auth_class
+        for auth_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    ]
@@ -14,3 +14,12 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+# Build the URL resolver's reverse/namespace caches at import time, so workers
+# forked from a preloading master (gunicorn --preload) inherit them instead of
+# paying for it on their first request
+from django.conf import settings
+from django.urls import get_resolver
+
+if not settings.DEBUG:
+    get_resolver().reverse_dict  # noqa: B018  (property access populates the caches)